@@ -0,0 +1,7 @@
+"""Headless entry point, e.g. python -m nba run marks --input dir/ --output out.zip"""
+import sys
+
+from .engine.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
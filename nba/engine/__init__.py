@@ -0,0 +1 @@
+"""Processing engine shared by the NBA pages (no Streamlit imports here)."""
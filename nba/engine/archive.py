@@ -0,0 +1,56 @@
+import io
+import tempfile
+import zipfile
+
+# Archives stay in memory up to this size and spill to a temp file beyond it
+SPOOL_BYTES = 32 * 2**20
+
+# Entries that are already compressed containers; compressing them again only costs time
+STORED_SUFFIXES = ('.xlsx', '.zip', '.parquet')
+
+
+def compression_for(name):
+    return zipfile.ZIP_STORED if name.lower().endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+
+
+def add_entry(zipf, name, data, compresslevel=6):
+    """Write one entry, stored or deflated by what it holds."""
+    zipf.writestr(name, data, compress_type=compression_for(name), compresslevel=compresslevel)
+
+
+def spooled_archive(max_size=SPOOL_BYTES):
+    """Scratch file for building a ZIP entry by entry."""
+    return tempfile.SpooledTemporaryFile(max_size=max_size)
+
+
+class ArchiveReader(io.RawIOBase):
+    """Read handle over a spooled archive, in a form st.download_button accepts without a copy on our side."""
+
+    def __init__(self, spool):
+        self._spool = spool
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._spool.seek(offset, whence)
+
+    def tell(self):
+        return self._spool.tell()
+
+    def readinto(self, buffer):
+        data = self._spool.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readall(self):
+        return self._spool.read()
+
+
+def download_handle(archive):
+    """The finished archive, rewound and ready to hand to a download button."""
+    archive.seek(0)
+    return ArchiveReader(archive)
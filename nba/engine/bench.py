@@ -0,0 +1,218 @@
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from .archive import add_entry
+from .co import split_by_co
+from .courses import course_workbook, split_by_course
+from .excel import highlighted_excel
+from .jobs import (divide_marks_frame, exam_workbook, pipeline_frame, read_subjects, split_exam_frame,
+                   split_st_frame, st_workbook, workbook_bytes)
+from .mapping import map_marks
+from .papers import CO_LAYOUTS, EXAM_LABELS, EXAMS, ST_NA_GROUPS, ST_STRUCTURE
+from .reader import ENGINE, SCHEMAS, read_sheet
+from .shift import remove_unattempted
+from .synthetic import (co_frame, course_frame, exam_frame, st_frame, subject_frame, uremove_frame,
+                        universal_frame)
+from .tables import table_bytes
+
+# Row counts of the full suite; `python -m nba bench --rows ...` picks any of them (or others)
+SIZES = (1000, 10000, 100000, 1000000)
+STAGES = ('read', 'compute', 'style', 'zip')
+SEED = 0
+
+# A stage regresses when it is this much slower (or bigger) than the baseline and above the noise floor
+TOLERANCE = 0.25
+NOISE_SECONDS = 0.02
+NOISE_MIB = 1.0
+
+
+def exam_case(page):
+    exams = EXAMS[page]
+    return {
+        'inputs': lambda rows, rng: [exam_frame(rows, rng, exams)],
+        'read': lambda datas: [read_sheet(datas[0])],
+        'compute': lambda frames, datas: split_exam_frame(frames[0], datas[0], exams, SEED, EXAM_LABELS[page]),
+        'style': lambda result: [("processed.xlsx", exam_workbook(*result[:2]))],
+    }
+
+
+def co_case(page):
+    required, value_cols, check_cols = CO_LAYOUTS[page]
+    return {
+        'inputs': lambda rows, rng: [co_frame(rows, rng, page)],
+        'read': lambda datas: [read_sheet(datas[0], required=required)],
+        'compute': lambda frames, datas: split_by_co(frames[0], value_cols, check_cols),
+        'style': lambda result: [("processed.xlsx", workbook_bytes(result[0])),
+                                 ("unprocessed.xlsx", workbook_bytes(result[1]))],
+    }
+
+
+def ete_inputs(rows, rng):
+    main_df = uremove_frame(rows, rng)
+    return [main_df, subject_frame(main_df, rng)]
+
+
+def pipeline_inputs(rows, rng):
+    marks_df = exam_frame(rows, rng)
+    return [marks_df, subject_frame(marks_df, rng)]
+
+
+def course_files(groups):
+    return [(f"output_{course}.xlsx", course_workbook(group)) for course, group in groups]
+
+
+# Each page as the stages its job runs: inputs(rows, rng) -> frames to upload, read(upload bytes) -> frames,
+# compute(frames, upload bytes) -> result, style(result) -> [(file name, bytes)]; every file is then zipped
+CASES = {
+    **{page: exam_case(page) for page in EXAMS},
+    'st': {
+        'inputs': lambda rows, rng: [st_frame(rows, rng)],
+        'read': lambda datas: [read_sheet(datas[0], **SCHEMAS['st'])],
+        'compute': lambda frames, datas: split_st_frame(frames[0], datas[0], ST_STRUCTURE, ST_NA_GROUPS, SEED),
+        'style': lambda result: [("output.xlsx", st_workbook(result[0]))],
+    },
+    'universal-splitter': {
+        'inputs': lambda rows, rng: [universal_frame(rows, rng)],
+        'read': lambda datas: [read_sheet(datas[0], **SCHEMAS['universal-splitter'])],
+        'compute': lambda frames, datas: divide_marks_frame(frames[0], datas[0], 5, 10.0, True, SEED),
+        'style': lambda result: [("processed.xlsx", workbook_bytes(result[0]))],
+    },
+    **{page: co_case(page) for page in CO_LAYOUTS},
+    'ete': {
+        'inputs': ete_inputs,
+        'read': lambda datas: [read_sheet(datas[0], **SCHEMAS['ete-main']), read_subjects(datas[1:])],
+        'compute': lambda frames, datas: map_marks(*frames),
+        'style': lambda result: [("output.xlsx", highlighted_excel(result).getvalue())],
+    },
+    'uremove': {
+        'inputs': lambda rows, rng: [uremove_frame(rows, rng)],
+        'read': lambda datas: [read_sheet(datas[0], **SCHEMAS['uremove'])],
+        'compute': lambda frames, datas: remove_unattempted(frames[0]),
+        'style': lambda result: [("cleaned.xlsx", workbook_bytes(result, engine='openpyxl'))],
+    },
+    'course-split': {
+        'inputs': lambda rows, rng: [course_frame(rows, rng)],
+        'read': lambda datas: [read_sheet(datas[0], **SCHEMAS['course-split'])],
+        'compute': lambda frames, datas: list(split_by_course(frames[0])),
+        'style': course_files,
+    },
+    'pipeline': {
+        'inputs': pipeline_inputs,
+        'read': lambda datas: [read_sheet(datas[0], required=SCHEMAS['ete-main']['required']),
+                               read_subjects(datas[1:])],
+        'compute': lambda frames, datas: list(split_by_course(pipeline_frame(frames[0], frames[1], datas[0], SEED))),
+        'style': course_files,
+    },
+}
+
+
+def upload_bytes(df, fmt):
+    """A synthetic frame as the bytes a user would upload."""
+    return workbook_bytes(df, engine='xlsxwriter') if fmt == 'xlsx' else table_bytes(df, fmt)
+
+
+def zip_files(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zipf:
+        for name, data in files:
+            add_entry(zipf, name, data)
+    return buffer.getvalue()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def peak_bytes(func, *args):
+    """Peak memory traced while func runs. Run apart from the timing, as tracing slows Python code down."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(page, rows, fmt='xlsx', memory=True):
+    """{stage: {seconds, rows_per_s, peak_mib}} for one page on `rows` synthetic rows uploaded as fmt.
+
+    With memory, every stage runs a second time under tracemalloc for its peak (else peak_mib is None).
+    """
+    case = CASES[page]
+    datas = [upload_bytes(df, fmt) for df in case['inputs'](rows, np.random.default_rng(SEED))]
+    stages = {
+        'read': lambda: case['read'](datas),
+        'compute': lambda frames: case['compute'](frames, datas),
+        'style': case['style'],
+        'zip': zip_files,
+    }
+
+    report = {}
+    value = ()
+    for stage in STAGES:
+        args = () if stage == 'read' else (value,)
+        result, seconds = timed(stages[stage], *args)
+        report[stage] = {
+            'seconds': round(seconds, 4),
+            'rows_per_s': round(rows / seconds) if seconds else None,
+            'peak_mib': round(peak_bytes(stages[stage], *args) / 2**20, 2) if memory else None,
+        }
+        value = result
+    return report
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'xlsx_reader': ENGINE,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def regressions(previous, current, tolerance=TOLERANCE):
+    """Lines describing every stage slower or bigger than its previous run by more than tolerance."""
+    flagged = []
+    for key, stages in current.items():
+        for stage, now in stages.items():
+            before = previous.get(key, {}).get(stage)
+            if not before:
+                continue
+            for metric, unit, noise in (('seconds', 's', NOISE_SECONDS), ('peak_mib', ' MiB', NOISE_MIB)):
+                if now[metric] is None or before.get(metric) is None:
+                    continue
+                if now[metric] > before[metric] * (1 + tolerance) and now[metric] - before[metric] > noise:
+                    flagged.append(f"{key} {stage}: {metric} {before[metric]}{unit} -> {now[metric]}{unit}")
+    return flagged
+
+
+def report_lines(key, report):
+    for stage, result in report.items():
+        rate = f"{result['rows_per_s']:,}" if result['rows_per_s'] else '-'
+        peak = '-' if result['peak_mib'] is None else f"{result['peak_mib']:.1f}"
+        yield f"{key:<32} {stage:<8} {result['seconds']:>9.3f}s {rate:>12} rows/s {peak:>9} MiB"
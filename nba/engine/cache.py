@@ -0,0 +1,134 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def cache_key(page, *parts):
+    """Hex digest identifying one result: page name plus upload bytes, parameters and seed."""
+    digest = hashlib.sha256(page.encode())
+    for part in parts:
+        data = part if isinstance(part, bytes) else repr(part).encode()
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU of finished results, optionally mirrored to a local directory.
+
+    Values are pickled, so an entry costs its serialised size and the bound
+    holds whatever the value is (output bytes, previews, row lists). With a
+    directory, entries survive restarts and are shared between processes;
+    file mtimes serve as the LRU order there.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key, default=None):
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+        if self.directory:
+            if blob is None:
+                blob = self._read_disk(key)
+                if blob is not None:
+                    self._remember(key, blob)
+            else:
+                self._touch_disk(key)
+        return default if blob is None else pickle.loads(blob)
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        self._remember(key, blob)
+        if self.directory:
+            self._write_disk(key, blob)
+
+    def fetch(self, key, compute):
+        """Cached value for key, running compute() and storing its result on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key, blob):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = blob
+            self._size += len(blob)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _read_disk(self, key):
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return blob
+
+    def _touch_disk(self, key):
+        try:
+            os.utime(os.path.join(self.directory, key))
+        except OSError:
+            pass
+
+    def _write_disk(self, key, blob):
+        path = os.path.join(self.directory, key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp, path)
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.tmp'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+
+# Shared by every page; NBA_CACHE_DIR enables the disk tier, NBA_CACHE_MB bounds each tier
+results = ResultCache(
+    max_bytes=int(os.environ.get('NBA_CACHE_MB', 256)) * 2**20,
+    directory=os.environ.get('NBA_CACHE_DIR') or None,
+)
@@ -0,0 +1,190 @@
+import argparse
+import io
+import os
+import sys
+import time
+import zipfile
+from functools import partial
+
+from .archive import add_entry
+from .bench import CASES, SIZES, TOLERANCE, benchmark, load_baseline, regressions, report_lines, save_baseline
+from .cache import cache_key, results
+from .formats import FORMATS, INPUT_SUFFIXES, output_name
+from .incremental import merge_stores, stores_key
+from .jobs import (course_zip_file, divide_marks_file, map_marks_files, pipeline_file, remove_unattempted_file,
+                   split_co_file, split_exam_file, split_st_file)
+from .papers import CO_LAYOUTS, EXAM_LABELS, EXAMS, ST_NA_GROUPS, ST_STRUCTURE
+from .pool import run_jobs
+from .profiling import TRACE_MEMORY, append_log, measured_since, profiled
+
+PAGES = sorted([*EXAMS, 'st', 'universal-splitter', *CO_LAYOUTS, 'uremove', 'course-split', 'ete', 'pipeline'])
+
+
+def input_files(paths):
+    """Every input given directly or found directly inside a given directory, in sorted order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if n.lower().endswith(INPUT_SUFFIXES) and not n.startswith('~$'))
+            files.extend(os.path.join(path, n) for n in names)
+        else:
+            files.append(path)
+    return files
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def page_job(page, data, args):
+    """(job function, cache key parts, function args) for one input, keyed as the page keys it."""
+    if page in EXAMS:
+        previous = results.get(stores_key(page, args.seed))
+        return (split_exam_file, (data, args.seed, args.format, args.chunk_rows),
+                (data, EXAMS[page], args.seed, EXAM_LABELS[page], args.format, previous, args.chunk_rows))
+    if page == 'st':
+        return (split_st_file, (data, args.seed, args.format),
+                (data, ST_STRUCTURE, ST_NA_GROUPS, args.seed, 40, args.format))
+    if page == 'universal-splitter':
+        mode = args.mode.title()
+        return (divide_marks_file, (data, args.divisions, mode, args.cap, args.seed, args.format),
+                (data, args.divisions, args.cap, mode == "Random", args.seed, args.format))
+    if page in CO_LAYOUTS:
+        return split_co_file, (data,), (data, *CO_LAYOUTS[page])
+    if page == 'pipeline':
+        subject_data = [read_bytes(path) for path in input_files(args.subjects)]
+        return pipeline_file, (data, *subject_data, args.seed), (data, subject_data, args.seed)
+    if page == 'uremove':
+        return remove_unattempted_file, (data, args.format), (data, args.format)
+    return course_zip_file, (data,), (data,)
+
+
+def run_page(args, files):
+    """Yield (input name, (result, stage records)) for every input, each as soon as it is done."""
+    if args.page == 'ete':
+        main_data = read_bytes(args.main)
+        subject_data = [read_bytes(path) for path in files]
+        key = cache_key('ete', main_data, *subject_data, args.format)
+        yield os.path.basename(args.main), results.fetch(
+            key, lambda: profiled(map_marks_files, main_data, subject_data, args.format, trace_memory=args.trace_memory))
+        return
+
+    jobs = []
+    for path in files:
+        func, key_parts, func_args = page_job(args.page, read_bytes(path), args)
+        jobs.append((os.path.basename(path), cache_key(args.page, *key_parts), func_args))
+    yield from run_jobs(partial(profiled, func, trace_memory=args.trace_memory), jobs, args.workers)
+
+
+def unzipped(data, folder):
+    """Entries of ZIP bytes, moved under folder/."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        return [(f"{folder}/{name}", zipf.read(name)) for name in zipf.namelist()]
+
+
+def output_entries(page, name, result, fmt='xlsx'):
+    """(ZIP entries, warning or None) for one finished input, named as the page names its downloads."""
+    stem = os.path.splitext(name)[0]
+    if page in EXAMS:
+        return [(output_name('processed', name, fmt), result)], None
+    if page in ('st', 'universal-splitter'):
+        if result is None:
+            return [], "no 'marks' column"
+        output, rows = result
+        prefix = 'output' if page == 'st' else 'processed'
+        return [(output_name(prefix, name, fmt), output)], f"invalid or unsplit rows {rows}" if rows else None
+    if page in CO_LAYOUTS:
+        if 'error' in result:
+            return [], result['error']
+        return unzipped(result['zip'], stem), None
+    if isinstance(result, str):
+        return [], result
+    if page == 'uremove':
+        return [(output_name('cleaned', name, fmt), result)], None
+    if page == 'ete':
+        return [(output_name('output', name, fmt), result[1])], None
+    return unzipped(result, stem), None
+
+
+def bench(args):
+    """Benchmark the chosen pages and sizes, flag regressions against the baseline file, then update it."""
+    previous = load_baseline(args.baseline).get('results', {})
+    current = {}
+    for page in args.pages:
+        for rows in args.rows:
+            key = f"{page}/{args.input_format}/{rows}"
+            current[key] = benchmark(page, rows, args.input_format, args.memory)
+            for line in report_lines(key, current[key]):
+                print(line)
+
+    flagged = regressions(previous, current, args.tolerance)
+    for line in flagged:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    save_baseline(args.baseline, {**previous, **current})
+    print(f"{len(flagged)} regression(s); baseline written to {args.baseline}", file=sys.stderr)
+    return 1 if flagged else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nba', description="Run the NBA pages headlessly over Excel, Parquet or Arrow files.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="process input files into one ZIP")
+    run.add_argument('page', choices=PAGES)
+    run.add_argument('--input', nargs='+', required=True, help="input files and/or directories holding them")
+    run.add_argument('--output', required=True, help="ZIP file to write")
+    run.add_argument('--seed', type=int, default=0, help="random seed (splitting pages)")
+    run.add_argument('--workers', type=int, help="worker processes (default: NBA_WORKERS or one per CPU)")
+    run.add_argument('--divisions', type=int, default=5, help="universal-splitter: number of divisions")
+    run.add_argument('--mode', choices=['equal', 'random'], default='equal', help="universal-splitter: division type")
+    run.add_argument('--cap', type=float, default=10.0, help="universal-splitter: max marks per division, 0 disables")
+    run.add_argument('--format', choices=list(FORMATS), default='xlsx',
+                     help="output format; parquet/arrow feed another page (CO pages, course-split and pipeline always write xlsx)")
+    run.add_argument('--chunk-rows', type=int,
+                     help="marks/drawing pages: read, split and write N rows at a time for bounded memory (xlsx output)")
+    run.add_argument('--main', help="ete: main file the subject files given by --input are mapped onto")
+    run.add_argument('--subjects', nargs='+', help="pipeline: ETE subject files and/or directories holding them")
+    run.add_argument('--trace-memory', action='store_true', default=TRACE_MEMORY,
+                     help="record each stage's tracemalloc peak in the profile log (slower; default: NBA_TRACE_MEMORY)")
+
+    timing = commands.add_parser('bench', help="time every page's read/compute/style/zip stages on synthetic inputs")
+    timing.add_argument('--pages', nargs='+', choices=list(CASES), default=list(CASES), help="pages to benchmark (default: all)")
+    timing.add_argument('--rows', nargs='+', type=int, default=list(SIZES[:2]),
+                        help=f"input row counts (default: %(default)s; full suite: {' '.join(map(str, SIZES))})")
+    timing.add_argument('--input-format', choices=list(FORMATS), default='xlsx', help="format of the synthetic uploads")
+    timing.add_argument('--baseline', default='bench-baseline.json', help="JSON results of the previous run, updated in place")
+    timing.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="slowdown or memory growth flagged as a regression (default: %(default)s = +25%%)")
+    timing.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="skip the tracemalloc pass that measures peak memory (faster)")
+    args = parser.parse_args(argv)
+    if args.command == 'bench':
+        return bench(args)
+
+    files = input_files(args.input)
+    if not files:
+        parser.error("no inputs found")
+    if args.page == 'ete' and not args.main:
+        parser.error("ete needs --main")
+    if args.page == 'pipeline' and not args.subjects:
+        parser.error("pipeline needs --subjects")
+
+    written = failed = 0
+    started = time.time()
+    with zipfile.ZipFile(args.output, "w") as zipf:
+        for name, (result, records) in run_page(args, files):
+            append_log(args.page, name, measured_since(records, started))
+            if args.page in EXAMS:
+                result, stores = result
+                if stores is not None:
+                    key = stores_key(args.page, args.seed)
+                    results.put(key, merge_stores(results.get(key), stores))
+            entries, warning = output_entries(args.page, name, result, args.format)
+            for arcname, data in entries:
+                add_entry(zipf, arcname, data)
+            written += len(entries)
+            failed += not entries
+            if warning:
+                print(f"{name}: {warning}", file=sys.stderr)
+    print(f"Wrote {written} file(s) to {args.output}", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+def divide_evenly(values, co):
+    """(n x co) parts of each value rounded to 2 places; the last part absorbs the rounding."""
+    base = np.round(values / co, 2)
+    parts = np.repeat(base[:, None], co, axis=1)
+    head_sum = np.zeros_like(base)
+    for _ in range(co - 1):
+        head_sum += base
+    parts[:, -1] = np.round(values - head_sum, 2)
+    return parts
+
+
+def present(col):
+    """Cells that are neither missing nor blank text."""
+    return (col.notna() & (col.astype(str).str.strip() != '')).to_numpy()
+
+
+def split_by_co(df, value_cols, check_cols, co_col='co'):
+    """Divide each value column evenly into `co` parts per row.
+
+    Returns (processed, unprocessed): rows where every check column is filled,
+    the values are numeric and co >= 1 get <col>_1..<col>_co columns appended;
+    every other row goes to unprocessed unchanged.
+    """
+    numbers = df[value_cols].apply(pd.to_numeric, errors='coerce')
+    co = np.trunc(pd.to_numeric(df[co_col], errors='coerce'))
+    valid = np.logical_and.reduce([present(df[col]) for col in check_cols])
+    valid &= numbers.notna().all(axis=1).to_numpy() & (co >= 1).to_numpy()
+
+    processed = df[valid]
+    co_values = co[valid].to_numpy(dtype=int)
+    values = numbers[valid].to_numpy(dtype=float)
+
+    blocks = []
+    for c in np.unique(co_values):
+        rows = co_values == c
+        blocks.append(pd.DataFrame(
+            np.hstack([divide_evenly(values[rows, j], c) for j in range(len(value_cols))]),
+            columns=[f'{col}_{i + 1}' for col in value_cols for i in range(c)],
+            index=processed.index[rows],
+        ))
+    max_co = int(co_values.max(initial=0))
+    part_cols = [f'{col}_{i + 1}' for col in value_cols for i in range(max_co)]
+    parts = pd.concat(blocks).reindex(index=processed.index, columns=part_cols) if blocks else pd.DataFrame(index=processed.index)
+
+    processed = pd.concat([processed, parts], axis=1).reset_index(drop=True)
+    return processed, df[~valid]
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from .splitter import U
+
+# Split marks are held as compact "split columns": nullable int8/int16 question marks with the U
+# sentinel for an unattempted question and NA (blank) on rows whose total could not be split.
+# Labels like "U" are only written when a frame is exported (render_splits())
+SPLIT_DTYPES = (pd.Int8Dtype, pd.Int16Dtype)
+
+
+def split_frame(matrix, columns, valid, index=None):
+    """A split matrix as split columns, blank on the rows that are not valid."""
+    blank = ~np.asarray(valid, dtype=bool)
+    return pd.DataFrame({col: pd.arrays.IntegerArray(matrix[:, i].copy(), blank.copy())
+                         for i, col in enumerate(columns)}, index=index)
+
+
+def split_columns(df):
+    """Names of df's split columns."""
+    return [col for col, dtype in df.dtypes.items() if isinstance(dtype, SPLIT_DTYPES)]
+
+
+def split_codes(col, blank=U):
+    """A split column as a plain int array, its blanks as the code blank."""
+    return col.to_numpy(dtype=np.int16, na_value=blank)
+
+
+def render_splits(df, u_label="U", blank=np.nan):
+    """df with its split columns as export values: marks as ints, U as u_label and blanks as blank."""
+    rendered = {}
+    for col in split_columns(df):
+        codes = split_codes(df[col])
+        values = codes.astype(object)
+        values[codes == U] = u_label
+        values[df[col].isna().to_numpy()] = blank
+        rendered[col] = values
+    return df.assign(**rendered) if rendered else df
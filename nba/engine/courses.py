@@ -0,0 +1,42 @@
+import io
+import zipfile
+
+import pandas as pd
+
+from .archive import add_entry
+from .codes import render_splits
+
+# Output format columns of every per-course sheet
+COURSE_COLUMNS = ['Class Roll Number', 'University Roll Number', 'name']
+COURSE_COLUMNS += [f'st1-{i}' for i in range(1, 11)]
+COURSE_COLUMNS += [f'st2-{i}' for i in range(1, 11)]
+COURSE_COLUMNS += [f'ete-q{i}' for i in range(1, 14)]
+
+
+def course_frame(input_df):
+    """Project the input onto COURSE_COLUMNS in one step; absent mark columns come out blank."""
+    projected = input_df.reindex(columns=COURSE_COLUMNS[2:], fill_value='')
+    projected.insert(0, 'University Roll Number', input_df['id'])
+    projected.insert(0, 'Class Roll Number', input_df['id'])
+    return projected
+
+
+def split_by_course(input_df):
+    """Yield (course-code, sheet frame) for every course, in order of first appearance."""
+    projected = course_frame(input_df)
+    for course, group in projected.groupby(input_df['course-code'], sort=False):
+        yield course, group.reset_index(drop=True)
+
+
+def course_workbook(frame):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        render_splits(frame).to_excel(writer, index=False)
+    return buffer.getvalue()
+
+
+def write_course_zip(input_df, file):
+    """Write output_<course>.xlsx for every course into a ZIP on file, each as soon as it is built."""
+    with zipfile.ZipFile(file, "w") as zipf:
+        for course, frame in split_by_course(input_df):
+            add_entry(zipf, f"output_{course}.xlsx", course_workbook(frame))
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# Grid for marks with a fractional part; whole marks are divided in whole units
+QUARTER = 0.25
+
+
+def marks_column(values):
+    """Marks as floats, with non-numeric, missing or negative entries set to 0, and that mask."""
+    marks = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    invalid = ~(marks >= 0)
+    return np.where(invalid, 0.0, marks), invalid
+
+
+def equal_units(total, cap, divisions):
+    """Even split of integer unit totals, the first divisions taking the remainder, capped per division."""
+    base = np.minimum(total // divisions, cap)
+    left = total - base * divisions
+    parts = np.repeat(base[:, None], divisions, axis=1)
+    parts += (np.arange(divisions)[None, :] < left[:, None]) & (parts < cap[:, None])
+    return parts
+
+
+def random_units(total, cap, divisions, rng):
+    """Random split of integer unit totals, capped per division, without any rejection loop.
+
+    Shares come from random weights; what flooring and capping leave over is
+    topped up, one division at a time in a random order, as far as each cap allows.
+    """
+    rows = np.arange(len(total))
+    weights = rng.random((len(total), divisions))
+    shares = total[:, None] * weights / np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+    parts = np.minimum(np.floor(shares).astype(np.int64), cap[:, None])
+    left = total - parts.sum(axis=1)
+    order = np.argsort(rng.random((len(total), divisions)), axis=1)
+    for j in range(divisions):
+        col = order[:, j]
+        add = np.minimum(cap - parts[rows, col], left)
+        parts[rows, col] += add
+        left -= add
+    return parts
+
+
+def distribute_marks(values, divisions, max_per_comp=0, random=False, rng=None):
+    """Divide every mark of a column into `divisions` parts in one call.
+
+    Marks with a fractional part are divided on a 0.25 grid, whole marks in
+    whole numbers; all arithmetic is done in integer grid units so parts add
+    up exactly. max_per_comp > 0 caps each part. Returns (parts, marks,
+    invalid): the (n_rows x divisions) matrix, the cleaned marks, and the
+    rows that were unreadable/negative or could not fit under the cap.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    marks, invalid = marks_column(values)
+    step = np.where(marks != np.trunc(marks), QUARTER, 1.0)
+    total = np.rint(marks / step).astype(np.int64)
+    if max_per_comp > 0:
+        cap = np.floor(max_per_comp / step + 1e-9).astype(np.int64)
+    else:
+        cap = total
+
+    units = random_units(total, cap, divisions, rng) if random else equal_units(total, cap, divisions)
+    invalid |= units.sum(axis=1) != total
+
+    if (step == 1.0).all():
+        return units, marks, invalid
+    return units * step[:, None], marks, invalid
@@ -0,0 +1,109 @@
+import io
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from .codes import render_splits
+
+HEADER_FILL = "#FFFF00"
+HIGHLIGHT_FILL = "#FFCCCC"
+
+# Fixed document date so the same frame always serialises to the same bytes
+DOCUMENT_DATE = datetime(2000, 1, 1)
+
+
+def column_widths(df):
+    """Longest header or value text per column plus 2, skipping blanks."""
+    widths = []
+    for col in df.columns:
+        values = df[col]
+        blank = values.isna().to_numpy() | (values.astype(str) == '').to_numpy()
+        lengths = values.astype(str).str.len().to_numpy()
+        longest = int(np.where(blank, 0, lengths).max(initial=0))
+        widths.append(max(longest, len(str(col))) + 2)
+    return widths
+
+
+def cell_rows(df, block_rows=10000):
+    """Yield row lists of plain Python values (missing cells as None), one block at a time."""
+    for start in range(0, len(df), block_rows):
+        values = df.iloc[start:start + block_rows].astype(object).to_numpy()
+        values[pd.isna(values)] = None
+        yield from values.tolist()
+
+
+def styled_excel(df, highlight_rows=(), sheet_name="Sheet1"):
+    """Write df as a styled XLSX in one pass and return it as a BytesIO.
+
+    Cells are bordered and centred, the header is filled yellow and rows at
+    the given positions are filled red. Rows are streamed with one shared
+    format each (constant_memory), so nothing is loaded back for styling.
+    """
+    highlight = np.zeros(len(df), dtype=bool)
+    highlight[np.asarray(list(highlight_rows), dtype=np.int64)] = True
+    return styled_excel_blocks([(df, highlight)], sheet_name)
+
+
+def styled_excel_blocks(blocks, sheet_name="Sheet1"):
+    """styled_excel() for a frame arriving as (block, highlight mask) pairs, written as they come.
+
+    The header is taken from the first block and column widths grow with
+    every block, so only one block is ever held. Split columns are rendered. xlsxwriter's constant_memory
+    mode keeps the written rows in a temporary file, not in memory.
+    """
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    workbook.set_properties({'created': DOCUMENT_DATE})
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    base = {'border': 1, 'align': 'center', 'valign': 'vcenter'}
+    header_format = workbook.add_format({**base, 'bold': True, 'bg_color': HEADER_FILL})
+    body_format = workbook.add_format(base)
+    highlight_format = workbook.add_format({**base, 'bg_color': HIGHLIGHT_FILL})
+
+    widths = None
+    row_idx = 0
+    for df, highlight in blocks:
+        df = render_splits(df)
+        if widths is None:
+            worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+            widths = column_widths(df)
+        else:
+            widths = [max(old, new) for old, new in zip(widths, column_widths(df))]
+        for values, flagged in zip(cell_rows(df), highlight):
+            row_idx += 1
+            worksheet.write_row(row_idx, 0, values, highlight_format if flagged else body_format)
+
+    for col_idx, width in enumerate(widths or []):
+        worksheet.set_column(col_idx, col_idx, width)
+
+    workbook.close()
+    output.seek(0)
+    return output
+
+
+def highlighted_excel(df, highlight_col='__highlight__', fills=None, sheet_name="Mapped Marks"):
+    """Stream df to XLSX, filling each row by the colour name in highlight_col.
+
+    One format per colour is shared by every highlighted cell; the highlight
+    column itself is not written, and split columns are rendered. Returns a
+    BytesIO, nothing touches disk.
+    """
+    fills = fills or {'red': "#FFC7CE", 'yellow': "#FFEB9C"}
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    workbook.set_properties({'created': DOCUMENT_DATE})
+    worksheet = workbook.add_worksheet(sheet_name)
+    formats = {name: workbook.add_format({'bg_color': colour}) for name, colour in fills.items()}
+
+    data = render_splits(df.drop(columns=highlight_col))
+    worksheet.write_row(0, 0, [str(col) for col in data.columns])
+    highlights = df[highlight_col].tolist()
+    for row_idx, values in enumerate(cell_rows(data)):
+        worksheet.write_row(row_idx + 1, 0, values, formats.get(highlights[row_idx]))
+
+    workbook.close()
+    output.seek(0)
+    return output
@@ -0,0 +1,29 @@
+import os
+
+# Output formats as (file suffix, MIME type). XLSX is the final export; Parquet and Arrow IPC
+# hand one page's output to the next page typed as it was, with no Excel round trip
+FORMATS = {
+    'xlsx': ('.xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ('.parquet', "application/vnd.apache.parquet"),
+    'arrow': ('.arrow', "application/vnd.apache.arrow.file"),
+}
+
+# Upload suffixes every page reads (.feather is Arrow IPC under its older name)
+INPUT_SUFFIXES = ('.xlsx', '.parquet', '.arrow', '.feather')
+
+# Rows per block when a sheet too large to load whole is processed in chunks (engine.reader.read_chunks)
+CHUNK_ROWS = 10000
+
+
+def table_format(data):
+    """Format of uploaded bytes, told by their magic number; anything else is taken as XLSX."""
+    if data[:4] == b'PAR1':
+        return 'parquet'
+    if data[:6] == b'ARROW1':
+        return 'arrow'
+    return 'xlsx'
+
+
+def output_name(prefix, name, fmt):
+    """prefix_<input stem><format suffix>, e.g. processed_marks.parquet."""
+    return f"{prefix}_{os.path.splitext(name)[0]}{FORMATS[fmt][0]}"
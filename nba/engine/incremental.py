@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from .cache import cache_key
+from .mapping import MAIN_COURSE_COL, MAIN_ID_COL, clean_col
+
+# Splits of earlier runs are kept per exam as a "rows store": a frame indexed by (id, course-code)
+# holding each row's total and its split, so a re-upload only splits rows that are new or changed.
+# Rows without an id, or whose key appears twice in one upload, are always split afresh and never stored.
+# One set of stores serves a page and seed, whatever sheet a row came from
+
+
+def stores_key(page, seed):
+    """Result cache key of the rows stores of an exam page run with seed."""
+    return cache_key(f'{page}-rows', seed)
+
+
+def row_keys(df):
+    """(id, course-code) of every row as a MultiIndex, or None when the upload lacks either column."""
+    if MAIN_ID_COL not in df.columns or MAIN_COURSE_COL not in df.columns:
+        return None
+    return pd.MultiIndex.from_arrays([clean_col(df[MAIN_ID_COL]), clean_col(df[MAIN_COURSE_COL])])
+
+
+def keyed(keys):
+    """Rows whose key is usable: an id is present and no other row of the upload shares the key."""
+    return (keys.get_level_values(0) != '') & ~keys.duplicated(keep=False)
+
+
+def reusable_splits(keys, totals, previous):
+    """Mask of rows split before with the same total, and the earlier split rows for them, in row order."""
+    if keys is None or previous is None:
+        return np.zeros(len(totals), dtype=bool), None
+    position = previous.index.get_indexer(keys)
+    found = keyed(keys) & (position >= 0)
+    earlier = previous['total'].to_numpy()[np.where(found, position, 0)]
+    reuse = found & (earlier == totals)
+    return reuse, previous.to_numpy()[position[reuse], 1:]
+
+
+def splits_store(keys, totals, matrix):
+    """One exam's rows store: total and split (in the split matrix's small int dtype) for every usable key."""
+    if keys is None:
+        return None
+    usable = keyed(keys)
+    store = pd.DataFrame(matrix[usable], index=keys[usable])
+    store.insert(0, 'total', totals[usable])
+    return store
+
+
+def merge_stores(stores, update):
+    """stores ({prefix: store}, or None) with update's rows added, replacing earlier rows under the same key."""
+    merged = dict(stores or {})
+    for prefix, store in update.items():
+        earlier = merged.get(prefix)
+        if store is not None:
+            merged[prefix] = store if earlier is None else pd.concat([earlier[~earlier.index.isin(store.index)], store])
+    return merged
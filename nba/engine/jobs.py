@@ -0,0 +1,305 @@
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from .archive import add_entry
+from .co import split_by_co
+from .codes import render_splits, split_frame
+from .courses import write_course_zip
+from .divide import distribute_marks
+from .excel import highlighted_excel, styled_excel, styled_excel_blocks
+from .formats import CHUNK_ROWS
+from .incremental import reusable_splits, row_keys, splits_store
+from .mapping import map_marks
+from .papers import EXAM_LABELS, EXAMS
+from .profiling import stage
+from .reader import SCHEMAS, MissingColumnsError, read_chunks, read_sheet
+from .rng import make_rng, stream_key
+from .shift import remove_unattempted
+from .splitter import feasible_totals, split_dtype, split_marks_batch
+from .tables import table_bytes
+
+# Everything here takes and returns plain bytes and picklable values, so it can run in a worker process.
+# Jobs whose output feeds another page take fmt: 'xlsx' (styled, final export), 'parquet' or 'arrow'
+
+MAIN_COLUMNS_ERROR = "❌ Main file must contain 'id' and 'course-code'."
+SUBJECT_COLUMNS_ERROR = "❌ Subject file(s) must contain 'Admission No. (Roll No.)' and 'Course Code'."
+
+
+def workbook_bytes(df, engine=None):
+    """Plain (unstyled) XLSX bytes of df, split columns rendered."""
+    buffer = io.BytesIO()
+    render_splits(df).to_excel(buffer, index=False, engine=engine)
+    return buffer.getvalue()
+
+
+def exam_totals(df, col_name, max_val, structure=None, na_groups=()):
+    """Truncated integer totals of an exam column and the mask of rows that can be split.
+
+    A row is valid when its total is within 0..max_val and, if a structure is
+    given, the total can be split into it.
+    """
+    if col_name in df.columns:
+        marks = np.trunc(pd.to_numeric(df[col_name], errors='coerce'))
+    else:
+        marks = pd.Series(np.nan, index=df.index)
+    valid = marks.between(0, max_val).to_numpy()
+    totals = np.where(valid, marks.fillna(0), 0).astype(np.int64)
+    if structure is not None:
+        feasible = feasible_totals(structure, na_groups)
+        in_table = totals < len(feasible)
+        valid &= in_table & feasible[np.where(in_table, totals, 0)]
+    return np.where(valid, totals, 0), valid
+
+
+def split_exam_frame(df, data, exams, seed, label="{prefix}-{key}", previous=None, block=0):
+    """df with every exam column split into questions, the mask of rows with an unsplittable total,
+    and the rows stores ({prefix: store}) a later upload of the same sheet can reuse.
+    The questions are split columns (engine.codes), rendered at export.
+
+    exams maps column -> (output prefix, max marks, structure, na groups);
+    question columns the upload already has are overwritten, not repeated.
+    the random streams are seeded from the upload bytes in data. Rows found
+    in previous (stores of an earlier run) under the same (id, course-code)
+    with the same total keep their earlier split; only the rest are split.
+    Block n > 0 of a chunked run draws from its own streams; block 0 draws
+    the whole sheet's, so a sheet within one block splits as unchunked.
+    """
+    keys = row_keys(df)
+    previous = previous or {}
+    invalid = np.zeros(len(df), dtype=bool)
+    parts = []
+    stores = {}
+
+    for col_name, (prefix, max_val, struct, na) in exams.items():
+        totals, valid = exam_totals(df, col_name, max_val, struct, na)
+        invalid |= ~valid
+        reuse, earlier = reusable_splits(keys, totals, previous.get(prefix))
+        matrix = np.empty((len(df), len(struct)), dtype=split_dtype(struct))
+        if reuse.any():
+            matrix[reuse] = earlier
+        rng = make_rng(seed, data, prefix, *([block] if block else []))
+        matrix[~reuse] = split_marks_batch(totals[~reuse], struct, na, rng)
+        columns = [label.format(prefix=prefix, key=k) for k in struct]
+        parts.append(split_frame(matrix, columns, valid, index=df.index))
+        stores[prefix] = splits_store(keys, totals, matrix)
+
+    # Split columns the upload already has (e.g. a processed sheet fed back in) are overwritten where they stand
+    split_df = pd.concat(parts, axis=1)
+    existing = [col for col in split_df.columns if col in df.columns]
+    out_df = pd.concat([df.assign(**{col: split_df[col] for col in existing}), split_df.drop(columns=existing)], axis=1)
+    return out_df, invalid, stores
+
+
+def split_values(out_df, u_label="U"):
+    """out_df as the XLSX writer takes it: split columns rendered, non-scalar cells of the input's text columns as text."""
+    for col in out_df.select_dtypes(exclude='number').columns:
+        out_df[col] = out_df[col].apply(lambda x: x if np.isscalar(x) else str(x))
+    return render_splits(out_df, u_label)
+
+
+def exam_workbook(out_df, invalid):
+    """Styled XLSX bytes of a split exam frame with its unsplittable rows highlighted."""
+    return styled_excel(split_values(out_df), np.flatnonzero(invalid)).getvalue()
+
+
+def split_exam_chunks(data, exams, seed, label="{prefix}-{key}", chunk_rows=CHUNK_ROWS):
+    """Styled XLSX bytes of split_exam_frame() run block by block, for sheets too large to load whole.
+
+    Each block of chunk_rows rows is read, split and streamed into the
+    output before the next is read, so memory is bounded by the block size
+    rather than the sheet (beyond the upload and output bytes themselves).
+    """
+    with stage('chunks', 0) as record:
+        return styled_excel_blocks(split_exam_blocks(data, exams, seed, label, chunk_rows, record)).getvalue()
+
+
+def split_exam_blocks(data, exams, seed, label, chunk_rows, record):
+    """Yield (split block, unsplittable mask) for every chunk_rows rows of an upload, counting rows in record."""
+    source = stream_key(data)
+    for block, df in enumerate(read_chunks(data, chunk_rows)):
+        out_df, invalid, _ = split_exam_frame(df, source, exams, seed, label, block=block)
+        record['rows'] = (record.get('rows') or 0) + len(df)
+        yield split_values(out_df), invalid
+
+
+def split_exam_file(data, exams, seed, label="{prefix}-{key}", fmt='xlsx', previous=None, chunk_rows=None):
+    """(output bytes, rows stores) of split_exam_frame() for an upload; in XLSX, unsplittable rows are highlighted.
+
+    With chunk_rows, an XLSX output is made by split_exam_chunks() instead;
+    blocks keep no rows stores, so the stores come back as None.
+    """
+    if chunk_rows and fmt == 'xlsx':
+        return split_exam_chunks(data, exams, seed, label, chunk_rows), None
+    df = read_sheet(data)
+    with stage('split', len(df)):
+        out_df, invalid, stores = split_exam_frame(df, data, exams, seed, label, previous)
+    with stage('style', len(df)):
+        output = exam_workbook(out_df, invalid) if fmt == 'xlsx' else table_bytes(out_df, fmt)
+    return output, stores
+
+
+def split_st_frame(df, data, structure, na_groups, seed, max_val=40):
+    """df with its 'marks' split into the structure's questions, and the split-row mask.
+
+    The questions are split columns (engine.codes); st_workbook() writes unattempted ones as "N/A".
+    """
+    totals, valid = exam_totals(df.fillna({'marks': 0}), 'marks', max_val, structure, na_groups)
+    matrix = split_marks_batch(totals, structure, na_groups, make_rng(seed, data))
+    split_df = split_frame(matrix, [str(col) for col in structure], valid, index=df.index)
+    return pd.concat([df, split_df], axis=1), valid
+
+
+def st_workbook(final_df):
+    """Styled XLSX bytes of a split ST frame, unattempted questions as "N/A"."""
+    return styled_excel(render_splits(final_df, "N/A")).getvalue()
+
+
+def split_st_file(data, structure, na_groups, seed, max_val=40, fmt='xlsx'):
+    """Output bytes and the unsplit row indices, or None without a 'marks' column."""
+    try:
+        df = read_sheet(data, **SCHEMAS['st'])
+    except MissingColumnsError:
+        return None
+
+    with stage('split', len(df)):
+        final_df, valid = split_st_frame(df, data, structure, na_groups, seed, max_val)
+    with stage('style', len(df)):
+        output = st_workbook(final_df) if fmt == 'xlsx' else table_bytes(final_df, fmt)
+
+    return output, np.flatnonzero(~valid).tolist()
+
+
+def divide_marks_frame(df, data, divisions, max_per_comp, random, seed):
+    """div_1..div_n plus marks for the 'marks' column of df, and the invalid-row mask."""
+    parts, marks, invalid = distribute_marks(df['marks'], divisions, max_per_comp, random, make_rng(seed, data))
+    out_df = pd.DataFrame(parts, columns=[f"div_{i+1}" for i in range(divisions)])
+    out_df['marks'] = marks
+    return out_df, invalid
+
+
+def divide_marks_file(data, divisions, max_per_comp, random, seed, fmt='xlsx'):
+    """Output bytes of div_1..div_n plus marks, and the invalid row indices, or None without 'marks'."""
+    try:
+        df = read_sheet(data, **SCHEMAS['universal-splitter'])
+    except MissingColumnsError:
+        return None
+    with stage('divide', len(df)):
+        out_df, invalid = divide_marks_frame(df, data, divisions, max_per_comp, random, seed)
+    with stage('style', len(df)):
+        output = workbook_bytes(out_df) if fmt == 'xlsx' else table_bytes(out_df, fmt)
+    return output, df.index[invalid].tolist()
+
+
+def split_co_file(data, required_columns, value_cols, check_cols):
+    """Previews and the processed/unprocessed ZIP for a CO upload, or its preview and an error."""
+    try:
+        df = read_sheet(data, required=required_columns)
+    except MissingColumnsError:
+        return {'preview': read_sheet(data, nrows=5), 'error': "Missing one or more required columns."}
+
+    # Divide every value column evenly among the COs, one NumPy op per CO count
+    with stage('co-split', len(df)):
+        processed_df, unprocessed_df = split_by_co(df, value_cols, check_cols)
+
+    buffer = io.BytesIO()
+    with stage('zip', len(df)), zipfile.ZipFile(buffer, "w") as zipf:
+        add_entry(zipf, "processed.xlsx", workbook_bytes(processed_df))
+        add_entry(zipf, "unprocessed.xlsx", workbook_bytes(unprocessed_df))
+
+    return {
+        'preview': df.head(),
+        'processed': processed_df.head(),
+        'unprocessed': unprocessed_df.head(),
+        'zip': buffer.getvalue(),
+    }
+
+
+def remove_unattempted_file(data, fmt='xlsx'):
+    """Output bytes of an upload with attempted marks shifted over its 'U' cells, or an error message."""
+    try:
+        df = read_sheet(data, **SCHEMAS['uremove'])
+    except MissingColumnsError as e:
+        return str(e)
+    with stage('shift', len(df)):
+        df = remove_unattempted(df)
+    with stage('style', len(df)):
+        return workbook_bytes(df, engine='openpyxl') if fmt == 'xlsx' else table_bytes(df, fmt)
+
+
+def read_subjects(subject_data):
+    """Every subject upload read and stacked into one frame."""
+    return pd.concat([read_sheet(data, **SCHEMAS['ete-subject']) for data in subject_data], ignore_index=True)
+
+
+def map_marks_files(main_data, subject_data, fmt='xlsx'):
+    """(preview frame, output bytes) for the main file with ETE marks mapped in, or an error message.
+
+    Unmapped rows are highlighted in XLSX only; the other formats leave the highlight out.
+    """
+    try:
+        main_df = read_sheet(main_data, **SCHEMAS['ete-main'])
+    except MissingColumnsError:
+        return MAIN_COLUMNS_ERROR
+    try:
+        subject_df = read_subjects(subject_data)
+    except MissingColumnsError:
+        return SUBJECT_COLUMNS_ERROR
+
+    with stage('map', len(main_df)):
+        final_df = map_marks(main_df, subject_df)
+    mapped_df = final_df.drop(columns='__highlight__')
+    with stage('style', len(final_df)):
+        output = highlighted_excel(final_df).getvalue() if fmt == 'xlsx' else table_bytes(mapped_df, fmt)
+    return render_splits(mapped_df), output
+
+
+def course_zip_file(data, file=None):
+    """ZIP of output_<course>.xlsx for every course in an upload, written onto file or returned as bytes.
+
+    Returns an error message instead when the upload lacks 'id' or 'course-code'.
+    """
+    try:
+        input_df = read_sheet(data, **SCHEMAS['course-split'])
+    except MissingColumnsError as e:
+        return str(e)
+    target = io.BytesIO() if file is None else file
+    with stage('zip', len(input_df)):
+        write_course_zip(input_df, target)
+    return target.getvalue() if file is None else file
+
+
+def pipeline_frame(marks_df, subject_df, data, seed):
+    """Raw marks split into questions, ETE marks mapped in and unattempted questions removed."""
+    with stage('split', len(marks_df)):
+        split_df = split_exam_frame(marks_df, data, EXAMS['marks'], seed, EXAM_LABELS['marks'])[0]
+    with stage('map', len(split_df)):
+        mapped_df = map_marks(split_df, subject_df).drop(columns='__highlight__')
+    with stage('shift', len(mapped_df)):
+        return remove_unattempted(mapped_df)
+
+
+def pipeline_file(data, subject_data, seed, file=None):
+    """Course ZIP straight from a raw marks upload and its ETE subject uploads.
+
+    Runs the marks split, the ETE mapping, the unattempted-question removal
+    and the course split in memory, handing frames from stage to stage; only
+    the per-course workbooks are serialised. Written onto file or returned
+    as bytes, or an error message when an upload lacks its key columns.
+    """
+    try:
+        marks_df = read_sheet(data, required=SCHEMAS['ete-main']['required'])
+    except MissingColumnsError:
+        return "❌ Marks file must contain 'id' and 'course-code'."
+    try:
+        subject_df = read_subjects(subject_data)
+    except MissingColumnsError:
+        return SUBJECT_COLUMNS_ERROR
+
+    cleaned_df = pipeline_frame(marks_df, subject_df, data, seed)
+    target = io.BytesIO() if file is None else file
+    with stage('zip', len(cleaned_df)):
+        write_course_zip(cleaned_df, target)
+    return target.getvalue() if file is None else file
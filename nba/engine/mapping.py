@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from .codes import render_splits
+
+# IDs whose unmapped rows are flagged red instead of yellow
+HIGHLIGHT_RED_IDS = frozenset({'2010990024', '2055991123', '2055991126', '2055991600'})
+
+ETE_COLUMNS = [f'ete-q{i}' for i in range(1, 17)]
+Q1_PARTS = [
+    'Obtained Marks Of Q1 \n (a)', 'Obtained Marks Of Q1 \n (b)',
+    'Obtained Marks Of Q1 \n (c)', 'Obtained Marks Of Q1 \n (d)',
+    'Obtained Marks Of Q1 \n (e)'
+]
+
+MAIN_ID_COL = 'id'
+MAIN_COURSE_COL = 'course-code'
+SUBJECT_ID_COL = 'Admission No. (Roll No.)'
+SUBJECT_COURSE_COL = 'Course Code'
+
+
+def clean_col(col):
+    """IDs/codes as stripped strings, undoing the '.0' Excel adds to numbers read as floats."""
+    return col.fillna('').astype(str).str.strip().str.removesuffix('.0')
+
+
+def map_marks(main_df, subject_df, red_ids=HIGHLIGHT_RED_IDS):
+    """Copy ETE question marks from the subject rows onto the main rows by (id, course-code).
+
+    Zero marks become 'U', and rows with no mapped marks get a '__highlight__'
+    of 'red' (ID in red_ids) or 'yellow'. Every step is a column/block operation.
+    """
+    main_df[MAIN_ID_COL] = clean_col(main_df[MAIN_ID_COL])
+    main_df[MAIN_COURSE_COL] = clean_col(main_df[MAIN_COURSE_COL])
+    subject_df[SUBJECT_ID_COL] = clean_col(subject_df[SUBJECT_ID_COL])
+    subject_df[SUBJECT_COURSE_COL] = clean_col(subject_df[SUBJECT_COURSE_COL])
+
+    if all(part in subject_df.columns for part in Q1_PARTS):
+        subject_df[Q1_PARTS] = subject_df[Q1_PARTS].apply(pd.to_numeric, errors='coerce')
+        subject_df['Obtained Marks Of Q1'] = subject_df[Q1_PARTS].sum(axis=1)
+
+    available = [i for i in range(1, 17) if f'Obtained Marks Of Q{i}' in subject_df.columns]
+    src_cols = [f'Obtained Marks Of Q{i}' for i in available]
+    subject_df[src_cols] = subject_df[src_cols].apply(pd.to_numeric, errors='coerce')
+    subject_df = subject_df[[SUBJECT_ID_COL, SUBJECT_COURSE_COL] + src_cols]
+
+    merged_df = pd.merge(
+        main_df,
+        subject_df,
+        how='left',
+        left_on=[MAIN_ID_COL, MAIN_COURSE_COL],
+        right_on=[SUBJECT_ID_COL, SUBJECT_COURSE_COL]
+    )
+
+    pairs = [(f'Obtained Marks Of Q{i}', f'ete-q{i}') for i in available if f'ete-q{i}' in merged_df.columns]
+    for src_col, dest_col in pairs:
+        merged_df[dest_col] = merged_df[src_col]
+    merged_df = merged_df.drop(columns=[SUBJECT_ID_COL, SUBJECT_COURSE_COL] + src_cols, errors='ignore')
+
+    missing = [col for col in ETE_COLUMNS if col not in merged_df.columns]
+    if missing:
+        merged_df = pd.concat([merged_df, pd.DataFrame(pd.NA, index=merged_df.index, columns=missing)], axis=1)
+
+    ete = render_splits(merged_df[ETE_COLUMNS]).astype(object)
+    merged_df[ETE_COLUMNS] = ete.mask(ete == 0, 'U')
+
+    unmapped = merged_df[ETE_COLUMNS].isna().all(axis=1).to_numpy()
+    red = merged_df[MAIN_ID_COL].isin(red_ids).to_numpy()
+    merged_df['__highlight__'] = np.select([unmapped & red, unmapped], ['red', 'yellow'], '')
+
+    return merged_df
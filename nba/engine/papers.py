@@ -0,0 +1,82 @@
+# Question-paper layouts: question -> max marks, and groups of which only one part is attempted
+
+STRUCTURE_13 = {
+    1: 5,
+    2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2,
+    8: 5, 9: 5, 10: 5, 11: 5,
+    12: 10, 13: 10
+}
+STRUCTURE_16 = {
+    'q1': 5,
+    'q2': 2, 'q3': 2, 'q4': 2, 'q5': 2, 'q6': 2, 'q7': 2,
+    'q8': 5, 'q9': 5, 'q10': 5, 'q11': 5, 'q12': 5, 'q13': 5,
+    'q14': 10, 'q15': 10, 'q16': 10
+}
+NA_GROUPS_13 = [[2, 3, 4, 5, 6, 7], [8, 9, 10, 11], [12, 13]]
+NA_GROUPS_16 = [['q2', 'q3', 'q4', 'q5', 'q6', 'q7'], ['q8', 'q9', 'q10', 'q11', 'q12', 'q13'], ['q14', 'q15', 'q16']]
+
+# Drawing papers with choices
+DRAWING_STRUCTURE_ST = {
+    1: 2, 2: 2, 3: 2, 4: 2, 5: 2,
+    6: 5, 7: 5, 8: 5, 9: 5, 10: 5,
+    11: 10, 12: 10
+}
+DRAWING_STRUCTURE_ETE = {
+    'q1': 2, 'q2': 2, 'q3': 2, 'q4': 2, 'q5': 2, 'q6': 2, 'q7': 2, 'q8': 2, 'q9': 2, 'q10': 2,
+    'q11': 5, 'q12': 5, 'q13': 5, 'q14': 5, 'q15': 5,
+    'q16': 10, 'q17': 10, 'q18': 10
+}
+DRAWING_NA_GROUPS_ST = [[6, 7, 8, 9, 10], [11, 12]]
+DRAWING_NA_GROUPS_ETE = [['q11', 'q12', 'q13', 'q14', 'q15'], ['q16', 'q17', 'q18']]
+
+# Drawing papers without choices
+PLAIN_STRUCTURE_ST = {
+    1: 2, 2: 2, 3: 2, 4: 2, 5: 2,
+    6: 5, 7: 5, 8: 5, 9: 5,
+    10: 10
+}
+PLAIN_STRUCTURE_ETE = {
+    1: 2, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2, 8: 2, 9: 2, 10: 2,
+    11: 5, 12: 5, 13: 5, 14: 5,
+    15: 10, 16: 10
+}
+
+# Exam columns per page: column -> (output prefix, max marks, structure, na groups)
+EXAMS = {
+    'marks': {
+        'st1-marks': ('st1', 40, STRUCTURE_13, NA_GROUPS_13),
+        'st2-marks': ('st2', 40, STRUCTURE_13, NA_GROUPS_13),
+        'ete-marks': ('ete', 60, STRUCTURE_16, NA_GROUPS_16),
+    },
+    'drawing-choice': {
+        'st1-marks': ('st1', 40, DRAWING_STRUCTURE_ST, DRAWING_NA_GROUPS_ST),
+        'st2-marks': ('st2', 40, DRAWING_STRUCTURE_ST, DRAWING_NA_GROUPS_ST),
+        'ete-marks': ('ete', 60, DRAWING_STRUCTURE_ETE, DRAWING_NA_GROUPS_ETE),
+    },
+    'drawing-no-choice': {
+        'st1-marks': ('st1', 50, PLAIN_STRUCTURE_ST, []),
+        'st2-marks': ('st2', 50, PLAIN_STRUCTURE_ST, []),
+        'ete-marks': ('ete', 60, PLAIN_STRUCTURE_ETE, []),
+    },
+}
+
+# Output column names per page
+EXAM_LABELS = {
+    'marks': "{prefix}-{key}",
+    'drawing-choice': "{prefix}-{key}",
+    'drawing-no-choice': "{prefix}-q{key}",
+}
+
+# Single-ST upload (st page): one 'marks' column out of 40
+ST_STRUCTURE = STRUCTURE_13
+ST_NA_GROUPS = [list(range(2, 8)), list(range(8, 12)), list(range(12, 14))]
+
+# Page -> (required columns, value columns divided among COs, columns that must be filled)
+CO_LAYOUTS = {
+    'theory': (['sno', 'roll', 'name', 'course-code', 'st1', 'st2', 'ete', 'co'],
+               ['st1', 'st2', 'ete'], ['st1', 'st2', 'ete', 'co']),
+    'lab': (['sno', 'roll', 'name', 'course-code', 'l1', 'l2', 'l3', 'l4', 'iv', 'ev', 'co'],
+            ['iv', 'ev'], ['l1', 'l2', 'l3', 'l4', 'iv', 'ev', 'co']),
+    'lab-total': (['sno', 'roll', 'name', 'course-code', 'im', 'em', 'co'],
+                  ['im', 'em'], ['im', 'em', 'co']),
+}
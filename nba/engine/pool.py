@@ -0,0 +1,45 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .cache import results
+
+_MISSING = object()
+
+
+def default_workers():
+    """Worker processes to use: NBA_WORKERS if set, else one per CPU."""
+    return int(os.environ.get('NBA_WORKERS', 0)) or os.cpu_count() or 1
+
+
+def run_jobs(func, jobs, workers=None, cache=results):
+    """Yield (name, result) for every (name, cache key, args) job, each as soon as it is done.
+
+    Cached results come first; the rest run func(*args) on up to `workers`
+    processes (inline when one is enough) and are cached as they finish.
+    Workers are spawned rather than forked, as the Streamlit server is threaded.
+    """
+    workers = default_workers() if workers is None else workers
+    pending = []
+    for name, key, args in jobs:
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            pending.append((name, key, args))
+        else:
+            yield name, value
+
+    if workers <= 1 or len(pending) <= 1:
+        for name, key, args in pending:
+            value = func(*args)
+            cache.put(key, value)
+            yield name, value
+        return
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(min(workers, len(pending)), mp_context=context) as pool:
+        futures = {pool.submit(func, *args): (name, key) for name, key, args in pending}
+        for future in as_completed(futures):
+            name, key = futures[future]
+            value = future.result()
+            cache.put(key, value)
+            yield name, value
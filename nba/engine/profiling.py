@@ -0,0 +1,95 @@
+import contextlib
+import contextvars
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Stage records go to this JSON-lines file, one object per stage, for trending across semesters
+LOG_PATH = os.environ.get('NBA_PROFILE_LOG', 'nba-profile.jsonl')
+
+# tracemalloc slows Python-heavy stages (openpyxl, xlsxwriter) down, so peak memory is opt-in
+TRACE_MEMORY = os.environ.get('NBA_TRACE_MEMORY', '') not in ('', '0')
+
+# Records of the job profiled in this context (thread or worker process), None outside profiled()
+_records = contextvars.ContextVar('nba_stage_records', default=None)
+
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    """Time the block as one stage of the job being profiled; a no-op outside profiled().
+
+    Yields the stage's record, so rows can be filled in once known.
+    """
+    records = _records.get()
+    if records is None:
+        yield {}
+        return
+
+    record = {'stage': name, 'rows': rows, 'at': time.time()}
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - start
+        record['seconds'] = round(seconds, 4)
+        record['rows_per_s'] = round(record['rows'] / seconds) if record['rows'] and seconds else None
+        peak = tracemalloc.get_traced_memory()[1] if tracing and tracemalloc.is_tracing() else None
+        record['peak_mib'] = None if peak is None else round(peak / 2**20, 2)
+        records.append(record)
+
+
+@contextlib.contextmanager
+def recording(records):
+    """Collect the stage() records of the block into the list records."""
+    token = _records.set(records)
+    try:
+        yield records
+    finally:
+        _records.reset(token)
+
+
+def profiled(func, *args, trace_memory=TRACE_MEMORY):
+    """(func(*args), its stage records): wall time, rows, rows/s and tracemalloc peak per stage.
+
+    Module-level and picklable with functools.partial, so jobs run through
+    it on worker processes and their records travel back with the result.
+    """
+    records = []
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        with recording(records):
+            result = func(*args)
+    finally:
+        if started:
+            tracemalloc.stop()
+    return result, records
+
+
+def measured_since(records, since):
+    """The records measured at or after the time.time() value since; the others came from the cache."""
+    return [record for record in records if record['at'] >= since]
+
+
+def append_log(page, source, records, path=LOG_PATH):
+    """Append one JSON line per stage record, tagged with the page and input name.
+
+    Profiling never fails a run: an unwritable log is skipped.
+    """
+    if not records or not path:
+        return
+    lines = []
+    for record in records:
+        at = datetime.fromtimestamp(record['at'], timezone.utc).isoformat(timespec='seconds')
+        lines.append(json.dumps({**record, 'at': at, 'page': page, 'input': source}) + '\n')
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+    except OSError:
+        pass
@@ -0,0 +1,152 @@
+import io
+import importlib.util
+from itertools import islice
+
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from .courses import COURSE_COLUMNS
+from .formats import CHUNK_ROWS, table_format
+from .mapping import ETE_COLUMNS, MAIN_COURSE_COL, MAIN_ID_COL, Q1_PARTS, SUBJECT_COURSE_COL, SUBJECT_ID_COL
+from .papers import CO_LAYOUTS
+from .profiling import stage
+from .shift import UREMOVE_PLAN
+from .tables import read_table, table_chunks, table_schema
+
+# calamine (Rust) parses XLSX several times faster than openpyxl; pandas' openpyxl path is read-only streaming
+ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+# Per-input schemas as read_sheet() keywords: columns that must exist, columns read as text
+# (IDs and codes, never float-mangled), and the columns to read at all (None reads every column).
+# course-split writes its ids back out, so they keep their cell type there
+SCHEMAS = {
+    'st': {'required': ['marks']},
+    'universal-splitter': {'required': ['marks']},
+    **{page: {'required': layout[0]} for page, layout in CO_LAYOUTS.items()},
+    'uremove': {'required': list(dict.fromkeys(col for out, inp in UREMOVE_PLAN for col in out + inp))},
+    'ete-main': {'required': [MAIN_ID_COL, MAIN_COURSE_COL], 'text': True},
+    'ete-subject': {
+        'required': [SUBJECT_ID_COL, SUBJECT_COURSE_COL],
+        'text': True,
+        'columns': [SUBJECT_ID_COL, SUBJECT_COURSE_COL, *Q1_PARTS,
+                    *[f'Obtained Marks Of Q{i}' for i in range(1, len(ETE_COLUMNS) + 1)]],
+    },
+    'course-split': {
+        'required': ['id', 'course-code'],
+        'text': ['course-code'],
+        'columns': ['id', 'course-code', *COURSE_COLUMNS[2:]],
+    },
+}
+
+
+class MissingColumnsError(ValueError):
+    def __init__(self, missing):
+        super().__init__(f"❌ Missing required column(s): {', '.join(map(str, missing))}")
+        self.missing = missing
+
+
+def check_columns(columns, required):
+    missing = [col for col in required if col not in set(columns)]
+    if missing:
+        raise MissingColumnsError(missing)
+
+
+def read_sheet(data, required=(), text=(), columns=None, nrows=None):
+    """First sheet of XLSX bytes, or a Parquet/Arrow IPC table, as a DataFrame.
+
+    Raises MissingColumnsError unless every `required` column is present;
+    openpyxl streams rows, so there the header is checked before any data
+    row is parsed. Only `columns` are kept when given; `text` columns
+    (True: all of them) are read as strings. Timed as a 'read' stage.
+    """
+    read = read_xlsx if table_format(data) == 'xlsx' else read_arrow
+    with stage('read') as record:
+        df = read(data, required, text, columns, nrows)
+        record['rows'] = len(df)
+    return df
+
+
+def read_xlsx(data, required=(), text=(), columns=None, nrows=None):
+    """read_sheet() for XLSX bytes."""
+    keep = None if columns is None else set(columns)
+    with pd.ExcelFile(io.BytesIO(data), engine=ENGINE) as book:
+        if ENGINE == 'openpyxl':
+            check_columns(book.parse(nrows=0).columns, required)
+        df = book.parse(
+            usecols=None if keep is None else (lambda col: col in keep),
+            dtype=str if text is True else ({col: str for col in text} or None),
+            nrows=nrows,
+        )
+    check_columns(df.columns, required)
+    return df
+
+
+def read_arrow(data, required=(), text=(), columns=None, nrows=None):
+    """read_sheet() for Parquet/Arrow IPC bytes, checked against the schema before any data is read.
+
+    Arrow keeps each column's type, so `text=True` only turns the required
+    (key) columns into strings rather than every column, written as in XLSX.
+    """
+    names = table_schema(data).names
+    check_columns(names, required)
+    df = read_table(data, None if columns is None else [col for col in names if col in set(columns)], nrows)
+    for col in (required if text is True else text):
+        if col in df.columns:
+            df[col] = text_col(df[col])
+    return df
+
+
+def text_col(col):
+    """A column as the strings read_excel(dtype=str) gives: whole floats (IDs with a blank cell) without '.0'."""
+    if pd.api.types.is_float_dtype(col):
+        return col.map(lambda value: str(int(value)) if value.is_integer() else str(value), na_action='ignore')
+    return col.map(str, na_action='ignore')
+
+
+def read_chunks(data, chunk_rows=CHUNK_ROWS, required=()):
+    """Yield the first sheet of XLSX bytes, or a Parquet/Arrow IPC table, as DataFrames of chunk_rows rows.
+
+    Only one block is held at a time, so memory is bounded by chunk_rows
+    rather than by the sheet. Raises MissingColumnsError (on the first
+    next()) unless every `required` column is present. A sheet without
+    data rows yields one empty frame.
+    """
+    if table_format(data) == 'xlsx':
+        yield from xlsx_chunks(data, chunk_rows, required)
+        return
+    check_columns(table_schema(data).names, required)
+    yield from table_chunks(data, chunk_rows)
+
+
+def xlsx_chunks(data, chunk_rows=CHUNK_ROWS, required=()):
+    """read_chunks() for XLSX bytes, through openpyxl's read-only row iterator.
+
+    Each block goes through pandas' own row parser, so values come out as
+    read_excel() gives them (numeric text as numbers), though judged per
+    block. Trailing blank header cells are dropped and fully blank rows
+    skipped, as there is no telling trailing ones apart.
+    """
+    book = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet = book.worksheets[0]
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        while header and header[-1] is None:
+            header.pop()
+        check_columns(header, required)
+        if not header:
+            yield pd.DataFrame()
+            return
+
+        width = len(header)
+        rows = (row[:width] + (None,) * (width - len(row)) for row in rows if any(v is not None for v in row))
+        block = list(islice(rows, chunk_rows))
+        yield TextParser([header, *block], header=0).read()
+        while len(block) == chunk_rows:
+            block = list(islice(rows, chunk_rows))
+            if block:
+                yield TextParser([header, *block], header=0).read()
+    finally:
+        book.close()
@@ -0,0 +1,22 @@
+import hashlib
+
+import numpy as np
+
+
+def stream_key(value):
+    """Non-negative integer key for an RNG stream: ints pass through, bytes/str are hashed."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = value.encode()
+    return int.from_bytes(hashlib.sha256(value).digest()[:8], 'little')
+
+
+def make_rng(seed, *keys):
+    """Independent numpy Generator for (seed, *keys).
+
+    Keys name the stream, e.g. the uploaded file's bytes and the exam column,
+    so the same upload and seed always replay the same draws, and separate
+    files, exams or row blocks never share state.
+    """
+    return np.random.default_rng(np.random.SeedSequence(int(seed), spawn_key=tuple(stream_key(k) for k in keys)))
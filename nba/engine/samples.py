@@ -0,0 +1,126 @@
+import io
+import zipfile
+from functools import lru_cache
+
+import xlsxwriter
+
+from .archive import add_entry
+from .papers import CO_LAYOUTS
+
+# Sample input files for the sidebar buttons, built once per process with xlsxwriter alone (no pandas)
+
+EXAM_SAMPLE = {
+    'sno': [1, 2, 3],
+    'id': ['2410994001', '2410994002', '2410994003'],
+    'name': ['avik', 'sanya', 'aman'],
+    'course-code': ['24ME0101', '24ME0102', '24ME0103'],
+    'st1-marks': [39, 38, 36],
+    'st2-marks': [38, 39, 37],
+    'ete-marks': [58, 58, 55]
+}
+
+UNIVERSAL_SAMPLE = {'marks': [39.5, 38, 36.5, 40, 21]}
+
+UREMOVE_SAMPLE = {
+    "sno": [1],
+    "id": ["23ME1001"],
+    "name": ["Test Student"],
+    "course-code": ["24MEC0505"],
+    "st1-marks": [30], "st2-marks": [28], "ete-marks": [70],
+    "A1": ["Yes"], "A2": ["Yes"], "A3": ["Yes"], "A4": ["Yes"],
+    "st1-1": [5], "st1-2": [5], "st1-3": ["U"], "st1-4": [5], "st1-5": [5], "st1-6": ["U"], "st1-7": [5], "st1-8": ["U"], "st1-9": ["U"], "st1-10": [5], "st1-11": ["U"], "st1-12": [5], "st1-13": [5],
+    "st2-1": [5], "st2-2": [5], "st2-3": ["U"], "st2-4": [5], "st2-5": [5], "st2-6": ["U"], "st2-7": [5], "st2-8": ["U"], "st2-9": ["U"], "st2-10": [5], "st2-11": ["U"], "st2-12": [5], "st2-13": [5],
+    "ete-q1": [5], "ete-q2": [5], "ete-q3": ["U"], "ete-q4": [5], "ete-q5": [5], "ete-q6": ["U"], "ete-q7": [5], "ete-q8": ["U"], "ete-q9": ["U"], "ete-q10": [5], "ete-q11": ["U"], "ete-q12": [5], "ete-q13": [5],
+    "ete-q14": ["U"], "ete-q15": ["U"], "ete-q16": ["U"]
+}
+
+COURSE_SAMPLE = {
+    'id': ['23ME1001', '23ME1002'],
+    'name': ['Alice', 'Bob'],
+    'course-code': ['24MEC0505', '24MEC0505'],
+    **{f'st1-{i}': [i, i+1] for i in range(1, 11)},
+    **{f'st2-{i}': [i, i+1] for i in range(1, 11)},
+    **{f'ete-q{i}': [i, i+1] for i in range(1, 14)}
+}
+
+ETE_MAIN_SAMPLE = {
+    'sno': [1],
+    'id': ['1234567890'],
+    'name': ['John Doe'],
+    'course-code': ['ME101'],
+    'st1-marks': [10],
+    'st2-marks': [12],
+    'ete-marks': [35],
+    **{f'A{i}': [''] for i in range(1, 5)},
+    **{f'st1-{i}': [1] for i in range(1, 14)},
+    **{f'st2-{i}': [2] for i in range(1, 14)},
+    **{f'ete-q{i}': [None] for i in range(1, 17)}
+}
+
+ETE_SUBJECT_SAMPLE = {
+    'Admission No. (Roll No.)': ['1234567890'],
+    'Course Code': ['ME101'],
+    'Obtained Marks Of Q1 \n (a)': [1],
+    'Obtained Marks Of Q1 \n (b)': [2],
+    'Obtained Marks Of Q1 \n (c)': [3],
+    'Obtained Marks Of Q1 \n (d)': [4],
+    'Obtained Marks Of Q1 \n (e)': [5],
+    **{f'Obtained Marks Of Q{i}': [i] for i in range(2, 17)}
+}
+
+
+def sample_workbook(data):
+    """XLSX bytes of column -> values data under a bold header row."""
+    buffer = io.BytesIO()
+    with xlsxwriter.Workbook(buffer, {'in_memory': True}) as workbook:
+        sheet = workbook.add_worksheet()
+        sheet.write_row(0, 0, list(data), workbook.add_format({'bold': True}))
+        for row_idx, row in enumerate(zip(*data.values()), start=1):
+            sheet.write_row(row_idx, 0, row)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def exam_sample():
+    return sample_workbook(EXAM_SAMPLE)
+
+
+@lru_cache(maxsize=None)
+def universal_sample():
+    return sample_workbook(UNIVERSAL_SAMPLE)
+
+
+@lru_cache(maxsize=None)
+def uremove_sample():
+    return sample_workbook(UREMOVE_SAMPLE)
+
+
+@lru_cache(maxsize=None)
+def course_sample():
+    return sample_workbook(COURSE_SAMPLE)
+
+
+@lru_cache(maxsize=None)
+def co_sample(page):
+    """Header-only workbook with the columns a CO page requires."""
+    return sample_workbook({col: [] for col in CO_LAYOUTS[page][0]})
+
+
+@lru_cache(maxsize=None)
+def ete_samples_zip():
+    """ZIP of the main-file and subject-file samples."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        add_entry(zf, "main-file.xlsx", sample_workbook(ETE_MAIN_SAMPLE))
+        add_entry(zf, "subject-file.xlsx", sample_workbook(ETE_SUBJECT_SAMPLE))
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def pipeline_samples_zip():
+    """ZIP of the raw marks-file and subject-file samples."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        add_entry(zf, "marks-file.xlsx", sample_workbook(EXAM_SAMPLE))
+        add_entry(zf, "subject-file.xlsx", sample_workbook(ETE_SUBJECT_SAMPLE))
+    return buffer.getvalue()
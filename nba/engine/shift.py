@@ -0,0 +1,88 @@
+import numpy as np
+
+from .codes import render_splits, split_codes, split_columns
+from .splitter import U
+
+# (out-group, in-group) rules: the in-group's attempted marks are packed into the out-group
+UREMOVE_PLAN = [
+    # --- ST1 ---
+    (['st1-2', 'st1-3', 'st1-4', 'st1-5', 'st1-6'], ['st1-2', 'st1-3', 'st1-4', 'st1-5', 'st1-6', 'st1-7']),
+    (['st1-7', 'st1-8', 'st1-9'], ['st1-8', 'st1-9', 'st1-10', 'st1-11']),
+    (['st1-10'], ['st1-12', 'st1-13']),
+    # --- ST2 ---
+    (['st2-2', 'st2-3', 'st2-4', 'st2-5', 'st2-6'], ['st2-2', 'st2-3', 'st2-4', 'st2-5', 'st2-6', 'st2-7']),
+    (['st2-7', 'st2-8', 'st2-9'], ['st2-8', 'st2-9', 'st2-10', 'st2-11']),
+    (['st2-10'], ['st2-12', 'st2-13']),
+    # --- ETE ---
+    (['ete-q2', 'ete-q3', 'ete-q4', 'ete-q5', 'ete-q6'], ['ete-q2', 'ete-q3', 'ete-q4', 'ete-q5', 'ete-q6', 'ete-q7']),
+    (['ete-q7', 'ete-q8', 'ete-q9', 'ete-q10', 'ete-q11'], ['ete-q8', 'ete-q9', 'ete-q10', 'ete-q11', 'ete-q12', 'ete-q13']),
+    (['ete-q12', 'ete-q13'], ['ete-q14', 'ete-q15', 'ete-q16']),
+]
+
+# Code of a slot left empty by the shift, next to U in packed split codes
+EMPTY = -2
+
+# Columns left empty once the plan has run
+UREMOVE_DROP = [
+    'st1-11', 'st1-12', 'st1-13',
+    'st2-11', 'st2-12', 'st2-13',
+    'ete-q14', 'ete-q15', 'ete-q16'
+]
+
+
+def left_pack(values, width, skip='U', fill=''):
+    """Move each row's non-skip values to the left in order, then cut or pad to width with fill."""
+    keep = values != skip
+    order = np.argsort(~keep, axis=1, kind='stable')
+    packed = np.take_along_axis(values, order, axis=1)[:, :width]
+    if packed.shape[1] < width:
+        packed = np.hstack([packed, np.full((len(values), width - packed.shape[1]), fill, dtype=values.dtype)])
+    packed[np.arange(width)[None, :] >= keep.sum(axis=1)[:, None]] = fill
+    return packed
+
+
+def code_labels(codes):
+    """Packed split codes as the cells an upload holds: marks, 'U' for U (blanks included) and '' for EMPTY."""
+    values = codes.astype(object)
+    values[codes == U] = 'U'
+    values[codes == EMPTY] = ''
+    return values
+
+
+def apply_shift_plan(df, plan=UREMOVE_PLAN):
+    """Apply every (out-group, in-group) rule of plan, in order, on a single copy of df.
+
+    Rules over split columns only (engine.codes, e.g. straight from the
+    splitter) pack int codes, with blanks taken as U; the other rules pack
+    objects. Shifted split columns come out as the object ones do.
+    """
+    columns = list(dict.fromkeys(col for cols_out, cols_in in plan for col in (*cols_in, *cols_out)))
+    coded = set(split_columns(df[columns]))
+    work = {col: split_codes(df[col]) if col in coded else df[col].to_numpy(dtype=object) for col in columns}
+    written = []
+    for cols_out, cols_in in plan:
+        if coded.issuperset([*cols_in, *cols_out]):
+            packed = left_pack(np.column_stack([work[col] for col in cols_in]), len(cols_out), skip=U, fill=EMPTY)
+        else:
+            values = [code_labels(work[col]) if col in coded else work[col] for col in cols_in]
+            packed = left_pack(np.column_stack(values), len(cols_out))
+            coded.difference_update(cols_out)
+        for i, col in enumerate(cols_out):
+            work[col] = packed[:, i]
+        written.extend(col for col in cols_out if col not in written)
+
+    out = df.copy()
+    for col in written:
+        out[col] = code_labels(work[col]) if col in coded else work[col]
+    return out
+
+
+def remove_unattempted(df, plan=UREMOVE_PLAN, drop=UREMOVE_DROP):
+    """Shift attempted marks left over 'U'/'N/A'/blank cells and drop the emptied columns.
+
+    Split columns are shifted as codes; every unattempted or blank cell left over comes out 'U'.
+    """
+    coded = split_columns(df)
+    df = df.replace("N/A", "U").fillna({col: "U" for col in df.columns if col not in coded})
+    df = render_splits(apply_shift_plan(df, plan), blank="U")
+    return df.drop(columns=[col for col in drop if col in df.columns])
@@ -0,0 +1,106 @@
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+# Sentinel for an un-attempted ("U") question inside a split matrix
+U = -1
+
+
+@lru_cache(maxsize=None)
+def ways_table(caps):
+    """ways[j, t]: number of ways questions j.. with the given caps add up to t.
+
+    Counts are kept as floats; they are only used as relative sampling weights.
+    """
+    top = sum(caps)
+    ways = np.zeros((len(caps) + 1, top + 1))
+    ways[-1, 0] = 1
+    for j in range(len(caps) - 1, -1, -1):
+        for v in range(caps[j] + 1):
+            ways[j, v:] += ways[j + 1, :top + 1 - v]
+    ways.setflags(write=False)
+    return ways
+
+
+@lru_cache(maxsize=None)
+def _na_combinations(structure_items, na_groups):
+    """Caps tuple for every way of leaving one question per na group un-attempted."""
+    keys = [k for k, _ in structure_items]
+    caps = [cap for _, cap in structure_items]
+    combos = []
+    for na_choice in product(*na_groups):
+        na_idx = tuple(keys.index(k) for k in na_choice)
+        combo_caps = tuple(0 if i in na_idx else cap for i, cap in enumerate(caps))
+        combos.append((na_idx, combo_caps))
+    return combos
+
+
+def _combinations(structure, na_groups):
+    return _na_combinations(tuple(structure.items()), tuple(tuple(g) for g in na_groups))
+
+
+def feasible_totals(structure, na_groups=()):
+    """Boolean array indexed by total: True where every U combination can reach it."""
+    combos = _combinations(structure, na_groups)
+    width = min(sum(caps) for _, caps in combos) + 1
+    feasible = np.ones(width, dtype=bool)
+    for _, caps in combos:
+        feasible &= ways_table(caps)[0, :width] > 0
+    return feasible
+
+
+def impossible_totals(structure, na_groups=(), max_val=None):
+    """Totals in 0..max_val that cannot be split into this structure."""
+    feasible = feasible_totals(structure, na_groups)
+    max_val = len(feasible) - 1 if max_val is None else max_val
+    return [t for t in range(max_val + 1) if t >= len(feasible) or not feasible[t]]
+
+
+def split_dtype(structure):
+    """Smallest int dtype holding every question mark of structure and U: int8, or int16 past 127."""
+    return np.int8 if max(structure.values(), default=0) <= np.iinfo(np.int8).max else np.int16
+
+
+def _sample_uniform(totals, caps, rng):
+    """Draw one split per total uniformly among all splits that respect caps."""
+    ways = ways_table(caps)
+    out = np.zeros((len(totals), len(caps)), dtype=np.int64)
+    remaining = totals.copy()
+    for j, cap in enumerate(caps):
+        rest = remaining[:, None] - np.arange(cap + 1)
+        weights = np.where(rest >= 0, ways[j + 1, np.maximum(rest, 0)], 0)
+        cum = weights.cumsum(axis=1)
+        draw = rng.random(len(totals)) * cum[:, -1]
+        out[:, j] = (cum <= draw[:, None]).sum(axis=1)
+        remaining -= out[:, j]
+    return out
+
+
+def split_marks_batch(totals, structure, na_groups=(), rng=None):
+    """Split a column of totals into an (n_rows x n_questions) matrix of question marks.
+
+    Every question stays within its cap from `structure`, and in each row one
+    question per group in `na_groups` is left un-attempted (stored as U).
+    The matrix is int8 (int16 for caps above 127). Splits are drawn uniformly from the precomputed ways tables in one pass
+    over the questions. Totals that cannot be split raise ValueError.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    totals = np.asarray(totals, dtype=np.int64)
+    combos = _combinations(structure, na_groups)
+
+    feasible = feasible_totals(structure, na_groups)
+    in_table = (totals >= 0) & (totals < len(feasible))
+    bad = ~in_table | ~feasible[np.where(in_table, totals, 0)]
+    if bad.any():
+        raise ValueError(f"totals {sorted(set(totals[bad].tolist()))} cannot be split into this structure")
+
+    scaled = np.empty((len(totals), len(structure)), dtype=split_dtype(structure))
+    choice = rng.integers(0, len(combos), size=len(totals))
+    for c in np.unique(choice):
+        rows = choice == c
+        na_idx, caps = combos[c]
+        block = _sample_uniform(totals[rows], caps, rng)
+        block[:, list(na_idx)] = U
+        scaled[rows] = block
+    return scaled
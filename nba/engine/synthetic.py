@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from .courses import COURSE_COLUMNS
+from .mapping import Q1_PARTS
+from .papers import CO_LAYOUTS, EXAMS
+
+# Synthetic inputs shaped like each page's sample file, for benchmarking at any row count.
+# Every generator takes (rows, rng) and returns a DataFrame; a few rows are deliberately bad
+
+STUDENTS_PER_COURSE = 60
+OUT_OF_RANGE = 0.02
+UNATTEMPTED = 0.3
+
+
+def ids(rows):
+    """Distinct 10-digit university roll numbers as text."""
+    return (2410000000 + np.arange(rows)).astype(str)
+
+
+def course_codes(rows, rng):
+    """A course code per row, about STUDENTS_PER_COURSE rows per course."""
+    courses = max(1, rows // STUDENTS_PER_COURSE)
+    return np.char.add('24ME', (1000 + rng.integers(0, courses, rows)).astype(str))
+
+
+def student_columns(rows, rng):
+    return {
+        'sno': np.arange(1, rows + 1),
+        'id': ids(rows),
+        'name': np.char.add('student-', np.arange(rows).astype(str)),
+        'course-code': course_codes(rows, rng),
+    }
+
+
+def marks(rows, rng, max_val, step=1):
+    """Marks within 0..max_val in the given step, with OUT_OF_RANGE of them above max, negative or absent."""
+    values = rng.integers(0, int(max_val / step) + 1, rows) * step
+    values = values.astype(object if step == 1 else float)
+    bad = np.flatnonzero(rng.random(rows) < OUT_OF_RANGE)
+    values[bad] = rng.choice(np.array([max_val + 5, -3, np.nan], dtype=object), len(bad))
+    return values
+
+
+def question_marks(rows, rng, high=10):
+    """Per-question marks with UNATTEMPTED of the cells 'U'."""
+    values = rng.integers(0, high + 1, rows).astype(object)
+    values[rng.random(rows) < UNATTEMPTED] = 'U'
+    return values
+
+
+def exam_frame(rows, rng, exams=EXAMS['marks']):
+    """marks / drawing pages: students plus one total per exam column."""
+    columns = student_columns(rows, rng)
+    for col_name, (prefix, max_val, struct, na) in exams.items():
+        columns[col_name] = marks(rows, rng, max_val)
+    return pd.DataFrame(columns)
+
+
+def st_frame(rows, rng):
+    return pd.DataFrame({
+        '#': np.arange(1, rows + 1),
+        'College Roll No.': ids(rows),
+        'Name': np.char.add('student-', np.arange(rows).astype(str)),
+        'marks': marks(rows, rng, 40),
+    })
+
+
+def universal_frame(rows, rng):
+    """Quarter-step marks up to 60, so some exceed the default 5 x 10 division cap."""
+    return pd.DataFrame({'marks': marks(rows, rng, 60, step=0.25)})
+
+
+def co_frame(rows, rng, page):
+    """A CO page's columns: numeric values, CO counts of 1..5 and a few blank cells."""
+    required, value_cols, check_cols = CO_LAYOUTS[page]
+    students = student_columns(rows, rng)
+    columns = {'sno': students['sno'], 'roll': students['id'], 'name': students['name'],
+               'course-code': students['course-code']}
+    for col in required[4:]:
+        values = (rng.integers(1, 6, rows) if col == 'co' else rng.integers(0, 101, rows)).astype(float)
+        values[rng.random(rows) < OUT_OF_RANGE] = np.nan
+        columns[col] = values
+    return pd.DataFrame(columns)
+
+
+def uremove_frame(rows, rng):
+    """A marks-page output: students, exam totals and every question column with 'U' cells."""
+    df = exam_frame(rows, rng)
+    questions = [f'st1-{i}' for i in range(1, 14)] + [f'st2-{i}' for i in range(1, 14)]
+    questions += [f'ete-q{i}' for i in range(1, 17)]
+    return pd.concat([df, pd.DataFrame({col: question_marks(rows, rng) for col in questions})], axis=1)
+
+
+def course_frame(rows, rng):
+    """A uremove output: students plus the course sheet's question columns."""
+    df = pd.DataFrame(student_columns(rows, rng))
+    return pd.concat([df, pd.DataFrame({col: rng.integers(0, 11, rows) for col in COURSE_COLUMNS[3:]})], axis=1)
+
+
+def subject_frame(main_df, rng, mapped=0.9):
+    """ETE subject export covering `mapped` of the main rows, shuffled, with some zero (unattempted) marks."""
+    rows = main_df.iloc[rng.permutation(len(main_df))[:int(len(main_df) * mapped)]]
+    count = len(rows)
+    columns = {'Admission No. (Roll No.)': rows['id'].to_numpy(), 'Course Code': rows['course-code'].to_numpy()}
+    columns.update({part: rng.integers(0, 3, count) for part in Q1_PARTS})
+    columns.update({f'Obtained Marks Of Q{i}': rng.integers(0, 11, count) for i in range(2, 17)})
+    return pd.DataFrame(columns)
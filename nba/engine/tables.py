@@ -0,0 +1,128 @@
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .codes import split_columns
+from .formats import table_format
+
+# Schema metadata key listing the columns stored as text because they mix numbers with labels like 'U'
+MIXED_KEY = b'nba.mixed'
+
+# Schema metadata key listing the split columns (engine.codes), stored as their nullable int codes
+SPLITS_KEY = b'nba.splits'
+
+
+def mixed_columns(df):
+    return [col for col in df.columns
+            if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed')]
+
+
+def table_bytes(df, fmt):
+    """df as Parquet or Arrow IPC file bytes.
+
+    Arrow columns hold one type, so object columns mixing numbers and labels
+    are stored as text and named in the schema metadata for read_table() to
+    turn back into numbers. Split columns keep their int codes (U and
+    blanks included) and are named there too, to come back as split columns.
+    """
+    df = df.rename(columns=str)
+    mixed = mixed_columns(df)
+    if mixed:
+        df = df.assign(**{col: df[col].map(str, na_action='ignore') for col in mixed})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        MIXED_KEY: json.dumps(mixed).encode(),
+        SPLITS_KEY: json.dumps(split_columns(df)).encode(),
+    })
+
+    sink = io.BytesIO()
+    if fmt == 'parquet':
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
+
+
+def table_schema(data):
+    """Arrow schema of Parquet or Arrow IPC bytes, read without touching the data."""
+    if table_format(data) == 'parquet':
+        return pq.read_schema(pa.BufferReader(data))
+    return pa.ipc.open_file(pa.BufferReader(data)).schema
+
+
+def restore_mixed(col):
+    """Numbers back out of a text-stored mixed column: whole numbers as int, others as float."""
+    numbers = pd.to_numeric(col, errors='coerce').to_numpy()
+    text = col.to_numpy(dtype=object)
+    values = text.copy()
+    numeric = ~pd.isna(numbers)
+    values[numeric] = numbers[numeric]
+    whole = numeric & col.str.fullmatch(r'-?\d+', na=False).to_numpy()
+    values[whole] = [int(v) for v in text[whole]]
+    return pd.Series(values, index=col.index, name=col.name)
+
+
+def read_table(data, columns=None, nrows=None):
+    """Parquet or Arrow IPC bytes as a DataFrame, reading only `columns` when given.
+
+    The bytes are read in place (no copy into Arrow buffers), and numbers
+    stored as text by table_bytes() come back as numbers.
+    """
+    source = pa.BufferReader(data)
+    if table_format(data) == 'parquet':
+        table = pq.read_table(source, columns=columns)
+    else:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    if nrows is not None:
+        table = table.slice(0, nrows)
+    return table_frame(table, *stored_columns(table.schema))
+
+
+def stored_columns(schema):
+    """(mixed, splits): the columns table_bytes() stored as text and as split codes."""
+    metadata = schema.metadata or {}
+    return json.loads(metadata.get(MIXED_KEY, b'[]')), json.loads(metadata.get(SPLITS_KEY, b'[]'))
+
+
+def table_frame(table, mixed=(), splits=()):
+    """An Arrow table or record batch as a DataFrame, with the mixed columns' numbers and the split columns restored."""
+    df = table.to_pandas()
+    for col in mixed:
+        if col in df.columns:
+            df[col] = restore_mixed(df[col])
+    for col in splits:
+        if col in df.columns:
+            df[col] = df[col].astype(f"Int{table.schema.field(col).type.bit_width}")
+    return df
+
+
+def table_chunks(data, chunk_rows):
+    """Yield Parquet or Arrow IPC bytes as DataFrames of at most chunk_rows rows, one record batch at a time.
+
+    Only the current batch is ever converted; an empty table yields one empty frame.
+    """
+    source = pa.BufferReader(data)
+    if table_format(data) == 'parquet':
+        reader = pq.ParquetFile(source)
+        schema = reader.schema_arrow
+        batches = reader.iter_batches(batch_size=chunk_rows)
+    else:
+        reader = pa.ipc.open_file(source)
+        schema = reader.schema
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+    stored = stored_columns(schema)
+    empty = True
+    for batch in batches:
+        for start in range(0, batch.num_rows, chunk_rows):
+            empty = False
+            yield table_frame(batch.slice(start, chunk_rows), *stored)
+    if empty:
+        yield table_frame(schema.empty_table(), *stored)
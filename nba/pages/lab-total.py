@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
-import zipfile
-import io
-import numpy as np
-import base64
+import time
+from engine.cache import cache_key, results
+from engine.papers import CO_LAYOUTS
+from engine.profiling import profiled
+from engine.samples import co_sample
+from ui import UPLOAD_TYPES, XLSX_MIME, ZIP_MIME, download, stage_table
 
 # Page headings
 st.title("Assessment Marks Processing Panel")
@@ -15,90 +16,23 @@ st.sidebar.title(":rainbow[Dr. Sonu Sharma Apps]")
 st.sidebar.subheader("Input/Output")
 
 # Button to download sample input file
-if st.sidebar.button("Download Sample Input File"):
-    sample_columns = ['sno', 'roll', 'name', 'course-code', 'im', 'em', 'co']
-    sample_df = pd.DataFrame(columns=sample_columns)
-    output = io.BytesIO()
-    sample_df.to_excel(output, index=False)
-    output.seek(0)
-    b64 = base64.b64encode(output.read()).decode()
-    href = f'<meta http-equiv="refresh" content="0;url=data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}">'
-    st.markdown(href, unsafe_allow_html=True)
+download("Download Sample Input File", co_sample('lab-total'), "sample_input.xlsx", XLSX_MIME, st.sidebar)
 
-uploaded_file = st.sidebar.file_uploader("Upload Excel file", type=["xlsx"])
-
-def trigger_download(zip_data, filename="output_files.zip"):
-    """Trigger automatic download of a zip file via a base64 link."""
-    b64 = base64.b64encode(zip_data).decode()
-    href = f'<meta http-equiv="refresh" content="0;url=data:application/zip;base64,{b64}">'
-    st.markdown(href, unsafe_allow_html=True)
+uploaded_file = st.sidebar.file_uploader("Upload Excel file", type=UPLOAD_TYPES)
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
-    st.write("### Preview of Uploaded File", df.head())
-
-    required_columns = ['sno', 'roll', 'name', 'course-code', 'im', 'em', 'co']
-    if not all(col in df.columns for col in required_columns):
-        st.error("Missing one or more required columns.")
-    else:
-        processed_rows = []
-        unprocessed_rows = []
-
-        for _, row in df.iterrows():
-            try:
-                if all(pd.notna(row[col]) and str(row[col]).strip() != '' for col in ['im', 'em', 'co']):
-                    im = float(row['im'])
-                    em = float(row['em'])
-                    co = int(row['co'])
-
-                    if co <= 0:
-                        raise ValueError("co must be > 0")
-
-                    def divide_evenly(value, co):
-                        parts = np.round([value / co] * co, 2)
-                        parts[-1] = round(value - sum(parts[:-1]), 2)
-                        return parts
-
-                    im_parts = divide_evenly(im, co)
-                    em_parts = divide_evenly(em, co)
+    from engine.jobs import split_co_file
 
-                    im_dict = {f'im_{i+1}': im_parts[i] for i in range(co)}
-                    em_dict = {f'em_{i+1}': em_parts[i] for i in range(co)}
+    started = time.time()
+    result, records = results.fetch(cache_key('lab-total', uploaded_file.getvalue()),
+                                    lambda: profiled(split_co_file, uploaded_file.getvalue(), *CO_LAYOUTS['lab-total']))
+    st.write("### Preview of Uploaded File", result['preview'])
 
-                    new_row = row.to_dict()
-                    new_row.update(im_dict)
-                    new_row.update(em_dict)
-
-                    processed_rows.append(new_row)
-                else:
-                    unprocessed_rows.append(row)
-            except Exception:
-                unprocessed_rows.append(row)
-
-        processed_df = pd.DataFrame(processed_rows)
-        unprocessed_df = pd.DataFrame(unprocessed_rows)
-
-        # Reorder columns
-        original_cols = df.columns.tolist()
-        im_cols = sorted([col for col in processed_df.columns if col.startswith('im_')], key=lambda x: int(x.split('_')[1]))
-        em_cols = sorted([col for col in processed_df.columns if col.startswith('em_')], key=lambda x: int(x.split('_')[1]))
-        ordered_cols = original_cols + im_cols + em_cols
-        processed_df = processed_df[ordered_cols]
-
-        # Display previews
-        st.write("### ✅ Processed Rows", processed_df.head())
-        st.write("### ⚠️ Unprocessed Rows", unprocessed_df.head())
-
-        # Create ZIP for download
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w") as zipf:
-            processed_io = io.BytesIO()
-            processed_df.to_excel(processed_io, index=False)
-            zipf.writestr("processed.xlsx", processed_io.getvalue())
-
-            unprocessed_io = io.BytesIO()
-            unprocessed_df.to_excel(unprocessed_io, index=False)
-            zipf.writestr("unprocessed.xlsx", unprocessed_io.getvalue())
+    if 'error' in result:
+        st.error(result['error'])
+    else:
+        st.write("### ✅ Processed Rows", result['processed'])
+        st.write("### ⚠️ Unprocessed Rows", result['unprocessed'])
+        download("📦 Download Output Files (ZIP)", result['zip'], "output_files.zip", ZIP_MIME)
 
-        buffer.seek(0)
-        trigger_download(buffer.getvalue())
+    stage_table('lab-total', [(uploaded_file.name, records)], started)
@@ -0,0 +1,51 @@
+import streamlit as st
+import time
+from engine.archive import download_handle, spooled_archive
+from engine.profiling import profiled
+from engine.samples import pipeline_samples_zip
+from ui import UPLOAD_TYPES, stage_table
+
+st.set_page_config(page_title="Pipeline", layout="wide")
+st.title("🔗 Marks to Course Sheets Pipeline")
+st.header(":green[ST1, ST2, ETE]", divider="rainbow")
+st.subheader(":red[Splits marks, maps ETE questions, removes un-attempted questions and splits by course in one go]", divider="rainbow")
+st.sidebar.title(":rainbow[Dr. Sonu Sharma Apps]")
+st.sidebar.subheader("Input/Output")
+
+st.sidebar.download_button(
+    label="⬇️ Download Sample Input Files (.zip)",
+    data=pipeline_samples_zip(),
+    file_name="sample_input_files.zip",
+    mime="application/zip"
+)
+
+marks_file = st.sidebar.file_uploader("Upload Marks File", type=UPLOAD_TYPES)
+subject_files = st.sidebar.file_uploader("Upload Subject File(s)", type=UPLOAD_TYPES, accept_multiple_files=True)
+seed = st.sidebar.number_input(
+    "Random seed", min_value=0, value=0, step=1,
+    help="Same file and seed always give the same split."
+)
+process_button = st.sidebar.button("Run Pipeline")
+
+# Same steps as marks -> ete -> uremove -> course-split, without the downloads and re-uploads in between
+if process_button and marks_file and subject_files:
+    from engine.jobs import pipeline_file
+
+    started = time.time()
+    with st.spinner("Running pipeline..."):
+        archive, records = profiled(pipeline_file, marks_file.getvalue(), [file.getvalue() for file in subject_files],
+                                    seed, spooled_archive())
+
+    if isinstance(archive, str):
+        st.error(archive)
+    else:
+        st.success("✅ Pipeline complete! Download the course sheets below.")
+        st.download_button(
+            label="📦 Download All Course Files as ZIP",
+            data=download_handle(archive),
+            file_name="all_course_outputs.zip",
+            mime="application/zip"
+        )
+    stage_table('pipeline', [(marks_file.name, records)], started)
+elif not (marks_file and subject_files):
+    st.info("👆 Please upload the Marks File and at least one Subject File.")
@@ -0,0 +1,65 @@
+import hashlib
+
+import streamlit as st
+from engine.formats import CHUNK_ROWS, INPUT_SUFFIXES
+from engine.profiling import append_log, measured_since
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MIME = "application/zip"
+
+# Every uploader takes Excel plus the Parquet/Arrow files the other pages can hand on
+UPLOAD_TYPES = [suffix.lstrip('.') for suffix in INPUT_SUFFIXES]
+
+OUTPUT_FORMATS = {"Excel (.xlsx)": 'xlsx', "Parquet (for the next page)": 'parquet', "Arrow IPC (for the next page)": 'arrow'}
+
+
+def download(label, data, file_name, mime, container=st):
+    """Download button serving raw bytes.
+
+    The widget is keyed by a hash of the content, so Streamlit registers each
+    payload once and an unchanged result stays the same button across reruns;
+    clicking it does not rerun the page.
+    """
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    return container.download_button(
+        label, data, file_name=file_name, mime=mime,
+        key=f"download-{digest}-{file_name}", on_click="ignore"
+    )
+
+
+def output_format(container=st.sidebar):
+    """Sidebar choice of output format: XLSX for the final export, Parquet/Arrow to feed another page."""
+    choice = container.selectbox(
+        "Output format", list(OUTPUT_FORMATS),
+        help="Parquet and Arrow keep column types and load much faster when passed on to the next page."
+    )
+    return OUTPUT_FORMATS[choice]
+
+
+def chunk_rows(container=st.sidebar):
+    """Sidebar switch for chunked processing: rows per block, or None to load each sheet whole."""
+    if not container.checkbox(
+        "Process large sheets in chunks",
+        help="Reads, splits and writes a block of rows at a time so memory stays bounded. "
+             "Excel output only; re-uploads are split afresh."
+    ):
+        return None
+    return container.number_input("Rows per chunk", min_value=1000, value=CHUNK_ROWS, step=1000)
+
+
+def stage_table(page, runs, since, container=st):
+    """Log the stage records measured since `since` and show every record in a collapsed table.
+
+    runs holds (input name, records) pairs. Records from before since came
+    back with a cached result: they are shown as cached and not logged again.
+    """
+    rows = []
+    for source, records in runs:
+        append_log(page, source, measured_since(records, since))
+        rows.extend({
+            'file': source, 'stage': record['stage'], 'seconds': record['seconds'], 'rows': record['rows'],
+            'rows/s': record['rows_per_s'], 'peak MiB': record['peak_mib'], 'cached': record['at'] < since,
+        } for record in records)
+    if rows:
+        with container.expander("⏱️ Stage timings"):
+            st.dataframe(rows, use_container_width=True, hide_index=True)